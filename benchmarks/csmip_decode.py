@@ -0,0 +1,50 @@
+# Claudio Perez
+"""
+Compare the fixed-width decoder used for CSMIP data blocks against
+the previous `np.genfromtxt` based implementation.
+
+    python benchmarks/csmip_decode.py [FILE.v2 ...]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+from quakeio.parse.csmip import _read_data_block, NUM_COLUMNS
+
+DATA = Path(__file__).parents[1]/"dat"/"58658_007_20210426_10.09.54.P"
+HEADER_LINES = 45
+
+
+def _genfromtxt_block(f, width=10):
+    count = int(next(f).split()[0])
+    options = dict(delimiter=width, dtype=float)
+    data = np.genfromtxt(f, max_rows=np.ceil(count/NUM_COLUMNS) - 1, **options).flatten()
+    return np.append(data, np.genfromtxt(f, max_rows=1, **options))
+
+
+def _fixed_width_block(f, width=10):
+    return _read_data_block(f, width)
+
+
+def decode(file, block_reader):
+    with open(file, "rb") as f:
+        for _ in range(HEADER_LINES):
+            next(f)
+        return [block_reader(f) for _ in ("accel", "veloc", "displ")]
+
+
+def main(files, number=5):
+    print(f"{'file':<16} {'genfromtxt':>12} {'fixed width':>12} {'speedup':>8}")
+    for file in files:
+        for old, new in zip(decode(file, _genfromtxt_block), decode(file, _fixed_width_block)):
+            assert np.array_equal(old, new)
+
+        t_old = min(timeit.repeat(lambda: decode(file, _genfromtxt_block), number=1, repeat=number))
+        t_new = min(timeit.repeat(lambda: decode(file, _fixed_width_block), number=1, repeat=number))
+        print(f"{Path(file).name:<16} {t_old*1e3:10.2f}ms {t_new*1e3:10.2f}ms {t_old/t_new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or sorted(DATA.glob("*.v2")))
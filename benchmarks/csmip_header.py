@@ -0,0 +1,52 @@
+# Claudio Perez
+"""
+Compare the time taken to parse the text header of CSMIP files with
+the compiled, line-indexed `HeaderParser` against the previous
+`parse_sequential_fields` implementation.
+
+    python benchmarks/csmip_header.py [FILE.v2 ...]
+"""
+import sys
+import timeit
+import fnmatch
+from pathlib import Path
+
+from quakeio.parse.csmip import HEADER_FIELDS, _parse_text_header
+from quakeio.utils.parseutils import parse_sequential_fields
+
+DATA = Path(__file__).parents[1]/"dat"/"58658_007_20210426_10.09.54.P"
+
+
+def _sequential_header(buffer, exclusions=()):
+    keys = []
+    for x in exclusions:
+        for k in HEADER_FIELDS:
+            if any(fnmatch.fnmatch(kk,x) for kk in k):
+                keys.append(k)
+
+    header_fields = {k: v for k,v in HEADER_FIELDS.items() if k not in keys}
+    lines = buffer.splitlines(keepends=True)
+    header_data = parse_sequential_fields(
+        (line.decode("utf-8", errors="replace") for line in lines), header_fields
+    )
+    header_data.pop("_")
+    return header_data
+
+
+def _compiled_header(buffer, exclusions=()):
+    return _parse_text_header(buffer, "v2", exclusions, None)
+
+
+def main(files, number=5):
+    print(f"{'file':<16} {'sequential':>12} {'compiled':>12} {'speedup':>8}")
+    for file in files:
+        buffer = Path(file).read_bytes()
+        assert _sequential_header(buffer) == _compiled_header(buffer)
+
+        t_old = min(timeit.repeat(lambda: _sequential_header(buffer), number=1, repeat=number))
+        t_new = min(timeit.repeat(lambda: _compiled_header(buffer), number=1, repeat=number))
+        print(f"{Path(file).name:<16} {t_old*1e3:10.3f}ms {t_new*1e3:10.3f}ms {t_old/t_new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or sorted(DATA.glob("*.v2")))
@@ -0,0 +1,36 @@
+# Claudio Perez
+"""
+Compare the single-pass NGA reader against the previous implementation,
+which scanned the header and then re-read the file with `np.genfromtxt`.
+
+    python benchmarks/nga_read.py [FILE.AT2 ...]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+from quakeio.parse.nga import read_nga
+
+DATA = Path(__file__).parents[1]/"dat"/"nga"
+
+
+def _genfromtxt_nga(read_file):
+    # The previous reader scanned the header before parsing the file
+    with open(read_file, "r") as f:
+        for _ in range(4):
+            next(f)
+    return np.genfromtxt(read_file, skip_header=4, skip_footer=1).flatten()
+
+
+def main(files, number=20):
+    print(f"{'file':<16} {'genfromtxt':>12} {'single pass':>12} {'speedup':>8}")
+    for file in files:
+        t_old = min(timeit.repeat(lambda: _genfromtxt_nga(file), number=1, repeat=number))
+        t_new = min(timeit.repeat(lambda: read_nga(file), number=1, repeat=number))
+        print(f"{Path(file).name:<16} {t_old*1e3:10.2f}ms {t_new*1e3:10.2f}ms {t_old/t_new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or sorted(DATA.glob("*.?T2")))
@@ -0,0 +1,36 @@
+# Claudio Perez
+"""
+Compare the time taken to load an event from its CSMIP archive with
+the time taken to load it from a `quake.npz` archive.
+
+    python benchmarks/npz_read.py [EVENT.zip ...]
+"""
+import sys
+import timeit
+import tempfile
+from pathlib import Path
+
+import quakeio
+
+DATA = Path(__file__).parents[1]/"dat"
+
+
+def main(files, number=5):
+    print(f"{'file':<40} {'csmip':>10} {'npz':>10} {'npz mmap':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for file in files:
+            npz = Path(tmp)/(Path(file).stem + ".npz")
+            quakeio.write(npz, quakeio.read(file))
+
+            times = [
+                min(timeit.repeat(read, number=1, repeat=number)) for read in (
+                    lambda: quakeio.read(file),
+                    lambda: quakeio.read(npz),
+                    lambda: quakeio.read(npz, mmap_mode="r"),
+                )
+            ]
+            print(f"{Path(file).name:<40} " + " ".join(f"{t*1e3:8.2f}ms" for t in times))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or sorted(DATA.glob("*.zip")))
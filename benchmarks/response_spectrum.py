@@ -0,0 +1,100 @@
+# Claudio Perez
+"""
+Compare the throughput of the vectorized response spectrum engine
+(`quakeio.response`) with the previous implementation, which
+integrated each oscillator separately with a Python Newmark loop,
+and the throughput of each backend on many short records, one at a
+time and as a single batch.
+
+    python benchmarks/response_spectrum.py [FILE.AT2 ...]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+from scipy.interpolate import interp1d
+
+import quakeio
+from quakeio.response import response_spectrum, BACKENDS
+
+DATA = Path(__file__).parents[1]/"dat"/"nga"
+
+PERIODS = np.arange(0.02, 1.0, 0.01)
+DAMPING = [0.02, 0.05]
+
+
+def _newmark_spectrum(accel, dt, damping, per, gamma=1/2, beta=1/4):
+    m = 1.0
+    t = np.arange(0, len(accel)*dt, dt)
+    SA = np.zeros((len(damping), len(per)))
+    for di, dmp in enumerate(damping):
+        for i in range(len(per)):
+            if dt/per[i] > 0.02:
+                dtp = per[i]*0.02
+                accfrn = interp1d(t, accel)(np.arange(0, max(t), dtp))[1:-1]
+            else:
+                dtp = dt
+                accfrn = accel
+            p = -m*accfrn
+            u = np.zeros(len(accfrn))
+            v = np.zeros(len(accfrn))
+            a = np.zeros(len(accfrn))
+            k = 4*np.pi**2*m/per[i]**2
+            c = 2*dmp*np.sqrt(k/m)
+            kstar = k + gamma*c/(beta*dtp) + m/(beta*dtp**2.0)
+            acons = m/(beta*dtp) + gamma*c/beta
+            bcons = m/(2*beta) + dtp*(gamma/(2*beta)-1)*c
+            a[0] = p[0]/m
+            for j in range(1, len(accfrn)):
+                deltau = (p[j]-p[j-1] + acons*v[j-1] + bcons*a[j-1])/kstar
+                deltav = gamma*deltau/(beta*dtp) - gamma*v[j-1]/beta + dtp*(1-gamma/(2*beta))*a[j-1]
+                deltaa = deltau/(beta*dtp**2) - v[j-1]/(beta*dtp) - a[j-1]/(2*beta)
+                u[j] = u[j-1] + deltau
+                v[j] = v[j-1] + deltav
+                a[j] = a[j-1] + deltaa
+            SA[di, i] = abs(max(a + accfrn, key=abs))
+    return SA
+
+
+def main(files, number=5):
+    print(f"{len(PERIODS)} periods, {len(DAMPING)} damping ratios")
+    print(f"{'file':<16} {'samples':>8} {'newmark':>12} {'vectorized':>12} {'max error':>10}")
+    for file in files:
+        series = quakeio.read(file)
+        accel, dt = series.data, series["time_step"]
+        t_old = timeit.timeit(lambda: _newmark_spectrum(accel, dt, DAMPING, PERIODS), number=1)
+        t_new = min(timeit.repeat(lambda: response_spectrum(accel, dt, PERIODS, DAMPING), number=1, repeat=number))
+        old = _newmark_spectrum(accel, dt, DAMPING, PERIODS)
+        new = response_spectrum(accel, dt, PERIODS, DAMPING)
+        print(f"{Path(file).name:<16} {len(accel):>8} {1/t_old:8.2f} rec/s {1/t_new:8.2f} rec/s "
+              f"{np.max(np.abs(new/old - 1)):9.2%}")
+
+
+def main_backends(files, length=500, number=200):
+    records = np.array([quakeio.read(file).data[:length] for file in files])
+    print(f"\n{'backend':<16} {f'{length} samples':>16} {'batch':>16}")
+    for backend in BACKENDS:
+        try:
+            # The first call compiles or loads compiled kernels
+            response_spectrum(records, 0.01, PERIODS, DAMPING, backend=backend)
+            response_spectrum(records[0], 0.01, PERIODS, DAMPING, backend=backend)
+        except ImportError as e:
+            print(f"{backend:<16} {'unavailable':>16} ({e})")
+            continue
+        repeat = max(1, number//len(records))
+        t_each = min(timeit.repeat(
+            lambda: [response_spectrum(accel, 0.01, PERIODS, DAMPING, backend=backend) for accel in records],
+            number=1, repeat=repeat
+        ))/len(records)
+        t_batch = min(timeit.repeat(
+            lambda: response_spectrum(records, 0.01, PERIODS, DAMPING, backend=backend),
+            number=1, repeat=repeat
+        ))/len(records)
+        print(f"{backend:<16} {1/t_each:10.1f} rec/s {1/t_batch:10.1f} rec/s")
+
+if __name__ == "__main__":
+    files = sys.argv[1:] or sorted(DATA.glob("*.AT2"))
+    main(files)
+    # Short records cut from each file
+    main_backends([file for file in files for _ in range(8)])
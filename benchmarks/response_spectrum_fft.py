@@ -0,0 +1,42 @@
+# Claudio Perez
+"""
+Compare the time domain and frequency domain (`method="fft"`)
+response spectra of every channel of the bridge records in `dat/`.
+
+    python benchmarks/response_spectrum_fft.py [EVENT.zip ...]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+import quakeio
+from quakeio.response import response_spectrum
+
+DATA = Path(__file__).parents[1]/"dat"
+
+PERIODS = np.arange(0.02, 1.0, 0.01)
+DAMPING = [0.02, 0.05]
+
+
+def main(files):
+    print(f"{len(PERIODS)} periods, {len(DAMPING)} damping ratios")
+    print(f"{'file':<40} {'channels':>8} {'time':>10} {'fft':>10} {'error':>7} {'T > 20dt':>9}")
+    for file in files:
+        records = [c.accel for c in quakeio.read(file).components]
+        spectra = {}
+        times = {}
+        for method in "time", "fft":
+            times[method] = timeit.timeit(lambda: spectra.update({method: [
+                response_spectrum(s.data, s["time_step"], PERIODS, DAMPING, method=method) for s in records
+            ]}), number=1)
+
+        error = np.array([np.abs(f/t - 1).max(axis=0) for t, f in zip(spectra["time"], spectra["fft"])]).max(axis=0)
+        long = PERIODS > 20*max(s["time_step"] for s in records)
+        print(f"{Path(file).name:<40} {len(records):>8} {times['time']:9.2f}s {times['fft']:9.2f}s "
+              f"{error.max():7.2%} {error[long].max():9.2%}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or [DATA/"nc73654060_ce58658p.zip", DATA/"RioDell_Petrolia_Processed_Data.zip"])
@@ -1,11 +1,12 @@
 # Claudio Perez
 __version__ = "0.1.19"
 
+import os
 import importlib
 from pathlib import Path
 from functools import reduce
 
-from .parse import csmip, nga, eqsig, basic_formats, opensees
+from .parse import csmip, nga, eqsig, basic_formats, opensees, chunked
 
 FILE_TYPES = {}
 
@@ -16,6 +17,7 @@ _register_file_type(csmip.FILE_TYPES)
 _register_file_type(eqsig.FILE_TYPES)
 _register_file_type(basic_formats.FILE_TYPES)
 _register_file_type(opensees.FILE_TYPES)
+_register_file_type(chunked.FILE_TYPES)
 
 # Map different file extensions to the name
 # of the parser that should be used by default
@@ -23,10 +25,18 @@ _register_file_type(opensees.FILE_TYPES)
 DEFAULT_TYPES = {
     ".at2":  "nga.at2",
     ".AT2":  "nga.at2",
+    ".vt2":  "nga.at2",
+    ".VT2":  "nga.at2",
+    ".dt2":  "nga.at2",
+    ".DT2":  "nga.at2",
     ".zip":  "csmip.zip",
     ".v2":   "csmip.v2",
     ".V2":   "csmip.v2",
+    ".v3":   "csmip.v3",
+    ".V3":   "csmip.v3",
     ".json": "json",
+    ".npz":  "quake.npz",
+    ".qkc":  "quake.chunked",
 }
 
 
@@ -40,9 +50,16 @@ def _find_function(module, name):
     return func
 
 
-def read(read_file, input_format=None, **kwds):
+def read(read_file, input_format=None, cache_dir=None, cache_hash=False, **kwds):
     """
     Generic ground motion reader
+
+    When `cache_dir` is given (`True` selects the default location), or
+    the environment variable `QUAKEIO_CACHE` is set, parsed files are
+    kept in an on-disk cache and later reads of an unchanged file load
+    the cached arrays instead of parsing it again; see `quakeio.cache`.
+    If `cache_hash` is True, entries are also keyed by a hash of the
+    contents of the file.
     """
     if "parser" in kwds and kwds["parser"] is not None:
         import quakeio
@@ -58,6 +75,12 @@ def read(read_file, input_format=None, **kwds):
             raise ValueError("Unable to deduce input format.\n")
 
     if typ in FILE_TYPES:
+        if cache_dir is None and os.environ.get("QUAKEIO_CACHE", None):
+            cache_dir = True
+        if cache_dir and isinstance(read_file, (str, os.PathLike)) and Path(read_file).is_file():
+            from .cache import cached_read
+            return cached_read(FILE_TYPES[typ]["read"], read_file, typ,
+                               cache_dir=cache_dir, cache_hash=cache_hash, **kwds)
         return FILE_TYPES[typ]["read"](read_file, **kwds)
 
     raise Exception()
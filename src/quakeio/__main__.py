@@ -12,7 +12,7 @@ def build_parser():
         description="""Parsers and utilities for processing and converting accelerograms.
 
         """,
-        usage="quakeio [MODE] [OPTIONS] FILE"
+        usage="quakeio [MODE] [OPTIONS] FILE\n       quakeio cache [list|purge|evict] [OPTIONS]"
     )
     modes = parser.add_argument_group("Modes")
     modes.add_argument("-A", "--all", dest="mode_process", action="store_true",
@@ -147,11 +147,54 @@ def run_validation(collection):
                 pass
     pass
 
+def build_cache_parser():
+    parser = argparse.ArgumentParser(
+        prog="quakeio cache",
+        description="Inspect and purge the cache of parsed files (see quakeio.read).",
+    )
+    parser.add_argument("action", nargs="?", default="list", choices=["list", "purge", "evict"],
+        help="List entries [default], remove all entries, or evict entries down to the size bound"
+    )
+    parser.add_argument("-d", "--dir", dest="directory", default=None,
+        help="Cache directory (default: $QUAKEIO_CACHE or ~/.cache/quakeio)"
+    )
+    parser.add_argument("-s", "--max-size", dest="max_size", type=int, default=None,
+        help="Bound on the size of the cache in bytes, used by `evict`"
+    )
+    return parser
+
+
+def cache_cli(action="list", directory=None, max_size=None):
+    from quakeio.cache import QuakeCache
+    cache = QuakeCache(directory, max_size)
+
+    if action == "list":
+        import time
+        entries = cache.entries()
+        for key, size, used in entries:
+            print(f"{key}  {size:>12d}  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(used))}")
+        total = sum(size for _, size, _ in entries)
+        print(f"{cache.directory}: {len(entries)} entries, {total} bytes (bound {cache.max_size})")
+
+    elif action == "purge":
+        removed = cache.purge()
+        print(f"{cache.directory}: removed {len(removed)} entries")
+
+    elif action == "evict":
+        removed = cache.evict()
+        print(f"{cache.directory}: removed {len(removed)} entries")
+
+
 def list_args(*args):
     args = build_parser().parse_args()
     return cli(**vars(args))
 
 def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    if args and args[0] == "cache":
+        return cache_cli(**vars(build_cache_parser().parse_args(args[1:])))
+
     args = build_parser().parse_args(args)
     try:
         cli(**vars(args))
@@ -0,0 +1,44 @@
+# Claudio Perez
+"""
+Time stepping for `quakeio.response` with JAX, used when
+`backend="jax"`. The recurrence of each oscillator is a `lax.scan`
+over the steps of a record, which is mapped with `vmap` over the
+oscillators of every period and damping ratio and over a batch of
+records, and compiled once for each shape with `jit`.
+
+Computations are carried out in double precision, which JAX only
+provides when 64-bit types are enabled, eg with
+
+    jax.config.update("jax_enable_x64", True)
+
+or the environment variable `JAX_ENABLE_X64=1`. Because this setting is
+global to the process, it is left to the caller; `sdof_peaks` raises
+ValueError when it is not enabled.
+"""
+import numpy as np
+import jax
+import jax.numpy as jnp
+from jax import lax
+
+
+def _peak(accel, A, B, kc):
+    # Response of a single oscillator to a single record
+    def step(carry, a):
+        x, peak = carry
+        x = A @ x + B @ a
+        return (x, jnp.maximum(peak, jnp.abs(kc @ x))), None
+
+    steps = jnp.stack([accel[:-1], accel[1:]], axis=-1)
+    (_, peak), _ = lax.scan(step, (jnp.zeros(2, accel.dtype), jnp.zeros((), accel.dtype)), steps)
+    return peak
+
+
+# Map over oscillators (last axis of A, B and kc), then over records
+_sdof_peaks = jax.jit(jax.vmap(jax.vmap(_peak, in_axes=(None, 2, 2, 1)), in_axes=(0, None, None, None)))
+
+
+def sdof_peaks(accel, A, B, kc):
+    if not jax.config.jax_enable_x64:
+        raise ValueError("backend 'jax' requires 64-bit types; enable them with "
+                         "jax.config.update(\"jax_enable_x64\", True) or JAX_ENABLE_X64=1")
+    return np.asarray(_sdof_peaks(*(jnp.asarray(x, dtype=jnp.float64) for x in (accel, A, B, kc))))
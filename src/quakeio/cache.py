@@ -0,0 +1,194 @@
+# Claudio Perez
+"""
+On-disk cache of parsed ground motions.
+
+When enabled (see `quakeio.read`), each parsed object is stored in its
+own directory under the cache directory; series data and spectra are
+saved as `.npy` arrays, and the hierarchy and metadata in a JSON
+sidecar, `meta.json`. Later reads of the same file memory-map the
+arrays instead of parsing the file again.
+
+Entries are keyed by the path, size and modification time of the file
+that was read (and optionally by a hash of its contents), the format
+it was read with, and the parser options. When the total size of the
+cache exceeds its bound, the least recently used entries are evicted.
+"""
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+import quakeio
+from quakeio.parse.basic_formats import pack_arrays, unpack_arrays, QuakeEncoder
+
+# Environment variables that enable the cache and bound its size.
+CACHE_ENV = "QUAKEIO_CACHE"
+CACHE_SIZE_ENV = "QUAKEIO_CACHE_SIZE"
+
+# Default bound on the total size of a cache, in bytes
+DEFAULT_CACHE_SIZE = 2**30
+
+# Parser options that do not change the result of a read,
+# and are therefore not part of the cache key.
+_IGNORED_OPTIONS = {"verbosity", "lazy", "workers", "executor"}
+
+_SIDECAR = "meta.json"
+
+
+def default_cache_dir() -> Path:
+    """
+    Return the cache directory named by the environment variable
+    `QUAKEIO_CACHE`, or `$XDG_CACHE_HOME/quakeio` (`~/.cache/quakeio`).
+    """
+    if os.environ.get(CACHE_ENV, None):
+        return Path(os.environ[CACHE_ENV]).expanduser()
+    return Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")).expanduser()/"quakeio"
+
+
+class QuakeCache:
+    """
+    A size-bounded, least-recently-used cache of parsed ground motions
+    in the directory `directory`. The bound `max_size` (in bytes) is
+    taken from the environment variable `QUAKEIO_CACHE_SIZE` when it
+    is not given.
+    """
+    def __init__(self, directory=None, max_size: int = None):
+        self.directory = Path(directory).expanduser() if directory is not None else default_cache_dir()
+        if max_size is None:
+            max_size = int(os.environ.get(CACHE_SIZE_ENV, DEFAULT_CACHE_SIZE))
+        self.max_size = max_size
+
+    def key(self, read_file, file_type: str, options: dict = None, content_hash: bool = False) -> str:
+        """
+        Return the key of the entry for `read_file` read as `file_type`
+        with the parser `options`. If `content_hash` is True, the key
+        also depends on a hash of the contents of the file.
+        """
+        path = Path(read_file).resolve()
+        stat = path.stat()
+        options = {
+            k: repr(v) for k, v in sorted((options or {}).items())
+                if k not in _IGNORED_OPTIONS
+        }
+        ident = [quakeio.__version__, str(path), stat.st_size, stat.st_mtime_ns, file_type, options]
+        if content_hash:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(2**20), b""):
+                    digest.update(block)
+            ident.append(digest.hexdigest())
+
+        return hashlib.sha256(json.dumps(ident).encode()).hexdigest()[:32]
+
+    def load(self, key: str, mmap_mode="c"):
+        """
+        Return the object stored under `key`, or None if there is no
+        such entry. Arrays are memory-mapped with `mmap_mode`; the default,
+        copy-on-write, lets the loaded data be modified without changing
+        the entry.
+        """
+        entry = self.directory/key
+        if not entry.is_dir():
+            return None
+        try:
+            with open(entry/_SIDECAR, "r") as f:
+                skeleton = json.load(f)
+            arrays = [
+                np.load(entry/f"{i}.npy", mmap_mode=mmap_mode) for i in range(skeleton["arrays"])
+            ]
+        except (OSError, ValueError, KeyError):
+            # Remove a damaged entry so that it can be stored again
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+        # Mark the entry as recently used
+        os.utime(entry/_SIDECAR)
+        return unpack_arrays(skeleton["data"], arrays)
+
+    def store(self, key: str, ground_motion):
+        """
+        Store `ground_motion` under `key` and evict least recently
+        used entries until the cache fits within `max_size`.
+        """
+        skeleton, arrays = pack_arrays(ground_motion)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Write the entry to a temporary directory and move it into
+        # place, so that readers never find a partial entry.
+        tmp = Path(tempfile.mkdtemp(dir=self.directory, prefix=".tmp-"))
+        try:
+            for i, array in enumerate(arrays):
+                np.save(tmp/f"{i}.npy", np.ascontiguousarray(array), allow_pickle=False)
+            with open(tmp/_SIDECAR, "w") as f:
+                json.dump({"arrays": len(arrays), "data": skeleton}, f, cls=QuakeEncoder)
+            os.replace(tmp, self.directory/key)
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self.evict()
+
+    def entries(self) -> list:
+        """
+        Return a list of `(key, size, last_used)` tuples for each
+        entry, ordered from the least to the most recently used.
+        """
+        if not self.directory.is_dir():
+            return []
+        entries = []
+        for entry in self.directory.iterdir():
+            if entry.name.startswith(".") or not (entry/_SIDECAR).is_file():
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir())
+            entries.append((entry.name, size, (entry/_SIDECAR).stat().st_mtime))
+        return sorted(entries, key=lambda e: e[2])
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_size: int = None) -> list:
+        """
+        Remove least recently used entries until the total size of the
+        cache is at most `max_size` (by default, `self.max_size`), and
+        return the keys of the removed entries.
+        """
+        max_size = self.max_size if max_size is None else max_size
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for key, size, _ in entries:
+            if total <= max_size:
+                break
+            shutil.rmtree(self.directory/key, ignore_errors=True)
+            total -= size
+            removed.append(key)
+        return removed
+
+    def purge(self) -> list:
+        """Remove every entry in the cache."""
+        return self.evict(0)
+
+
+def cached_read(read, read_file, file_type, cache_dir=None, cache_hash=False, **kwds):
+    """
+    Return `read(read_file, **kwds)`, using the cache in `cache_dir`
+    (`True` selects `default_cache_dir()`). Reads with `lazy=True` use
+    an existing entry, but do not store one.
+    """
+    cache = QuakeCache(None if cache_dir is True else cache_dir)
+    key = cache.key(read_file, file_type, kwds, content_hash=cache_hash)
+
+    ground_motion = cache.load(key)
+    if ground_motion is None:
+        ground_motion = read(read_file, **kwds)
+        # Storing an entry loads every series, so a lazy read does not
+        # populate the cache; it is served from entries stored by
+        # other reads of the file
+        if not kwds.get("lazy", False):
+            cache.store(key, ground_motion)
+    return ground_motion
@@ -1,9 +1,12 @@
 # Claudio Perez
 # 2021
 import json
+import operator
 from copy import copy
+from functools import lru_cache
 from pathlib import Path
 import warnings
+from collections import OrderedDict
 from enum import Enum
 
 #import opensees.units
@@ -16,6 +19,17 @@ class pt(Enum): SECT,  PLAN,  ELEV  = range(3)
 
 DIRECTIONS = ["long", "tran", "up"]
 
+# Approximate bytes of oscillator response held by each chunk of
+# records in `QuakeCollection.spectra`
+SPECTRA_CHUNK_BYTES = 64*2**20
+
+# Number of distinct time axes shared by `time_axis`
+TIME_AXIS_CACHE_SIZE = 64
+
+# Total bytes of the arrays of times kept for reuse by `TimeAxis`;
+# the least recently used arrays are released first
+TIME_AXIS_CACHE_BYTES = 32*2**20
+
 
 class QuakeCollection(dict):
     """
@@ -56,6 +70,101 @@ class QuakeCollection(dict):
         for component in self.components:
             component.convert_units(units)
 
+    def spectra(self, periods, damping, workers=None, executor=None, chunk_size=None, **kwds) -> dict:
+        """
+        Compute the response spectra of the acceleration of every
+        component. Returns a dict mapping the key of each motion to a
+        dict mapping the direction of each component to an array of
+        shape (dampings, periods) (see `quakeio.response.response_spectrum`,
+        to which `kwds` are passed).
+
+        Series with the same time step and length are stacked and
+        computed in chunks of `chunk_size` records. By default, chunks
+        are sized so that the response of their oscillators over one
+        block of time steps takes about `SPECTRA_CHUNK_BYTES`. When
+        `workers` is greater than one, chunks are computed by a pool of
+        `workers` processes; alternatively, an existing
+        `concurrent.futures.Executor` may be passed as `executor`.
+        """
+        from functools import partial
+        from concurrent.futures import ProcessPoolExecutor
+        from quakeio.response import response_spectrum
+
+        if chunk_size is None:
+            oscillators = np.size(periods)*np.size(damping)
+            chunk_size = max(1, SPECTRA_CHUNK_BYTES//(2*8*kwds.get("block", 1024)*oscillators))
+
+        tasks = []
+        for (dt, _), records in self._accel_groups().items():
+            for i in range(0, len(records), chunk_size):
+                chunk = records[i:i + chunk_size]
+                tasks.append((dt, [r[:2] for r in chunk], np.stack([r[2].accel.data for r in chunk])))
+
+        compute = partial(response_spectrum, periods=periods, damping=damping, **kwds)
+        if executor is None and (workers is None or workers <= 1):
+            results = [compute(accel, dt) for dt, _, accel in tasks]
+        else:
+            pool = executor if executor is not None else ProcessPoolExecutor(workers)
+            try:
+                results = list(pool.map(compute, [t[2] for t in tasks], [t[0] for t in tasks]))
+            finally:
+                if executor is None:
+                    pool.shutdown()
+
+        spectra = {}
+        for (_, labels, _), result in zip(tasks, results):
+            for (loc, drn), sa in zip(labels, result):
+                spectra.setdefault(loc, {})[drn] = sa
+        return spectra
+
+    def intensity_measures(self, threshold: float = 0.05) -> dict:
+        """
+        Compute the intensity measures of every component (see
+        `QuakeComponent.intensity_measures`), stacking the records
+        that share a time step and length. Returns a dict mapping the
+        key of each motion to a dict mapping the direction of each
+        component to its measures.
+        """
+        from quakeio.intensity import intensity_measures
+
+        measures = {}
+        for (dt, _), records in self._accel_groups().items():
+            components = [r[2] for r in records]
+            stacked = {
+                s: np.stack([getattr(c, s).data for c in components]) if all(
+                    getattr(c, s) is not None and len(getattr(c, s).data) == len(c.accel.data) for c in components
+                ) else None for s in ("veloc", "displ")
+            }
+            result = intensity_measures(
+                np.stack([c.accel.data for c in components]), dt,
+                g=[_gravity(c.accel) for c in components],
+                threshold=threshold, **stacked
+            )
+            for i, (loc, drn, component) in enumerate(records):
+                measures.setdefault(loc, {})[drn] = component._intensity_measures(
+                    {k: v[i] for k, v in result.items()}
+                )
+        return {loc: measures[loc] for loc in self.motions if loc in measures}
+
+    def _accel_groups(self) -> dict:
+        # Components with accel data, grouped by time step and length;
+        # components without a time step are skipped
+        groups, skipped = {}, []
+        for loc, motion in self.motions.items():
+            for drn, component in motion.components.items():
+                series = component.accel
+                if series is None or len(series.data) == 0:
+                    continue
+                try:
+                    key = (series["time_step"], len(series.data))
+                except KeyError:
+                    skipped.append(f"{loc}/{drn}")
+                    continue
+                groups.setdefault(key, []).append((loc, drn, component))
+        if skipped:
+            warnings.warn(f"Skipping components without a time step: {', '.join(skipped)}")
+        return groups
+
     def match(self, t, *args, **kwds):
         if callable(t):
             pass
@@ -144,6 +253,8 @@ class QuakeMotion(dict):
         self.update(meta if meta is not None else {})
         for comp in self.components.values():
             comp._parent = self
+        # Contiguous buffers of each series type; see `pack`
+        self._buffers = {}
 
     @property
     def long(self):
@@ -154,21 +265,111 @@ class QuakeMotion(dict):
 
     @property
     def accel(self):
-        return np.stack(tuple(c.accel for c in self.components.values())).T
+        return self._stacked("accel")
 
     @property
     def veloc(self):
-        return np.stack(tuple(c.veloc for c in self.components.values())).T
+        return self._stacked("veloc")
 
     @property
     def displ(self):
-        return np.stack(tuple(c.displ for c in self.components.values())).T
+        return self._stacked("displ")
+
+    def pack(self):
+        """
+        Copy the data of each series type ("accel", "veloc", "displ")
+        of all components into one contiguous array of shape (samples,
+        components), with columns in the order of `components`, and
+        make the data of each component series a view of its column.
+
+        While the views are in place, `accel`, `veloc` and `displ`
+        return these arrays without copying, and `rotate`,
+        `resultant` and the difference and sum of packed motions
+        operate on them with single array operations. Series types
+        whose lengths differ between components are not packed.
+        """
+        for typ in ("accel", "veloc", "displ"):
+            series = [getattr(c, typ) for c in self.components.values()]
+            if not series or any(s is None for s in series) or len({len(s.data) for s in series}) != 1:
+                self._buffers.pop(typ, None)
+                continue
+            buffer = np.empty((len(series[0].data), len(series)), dtype=np.result_type(*(s.data for s in series)))
+            for i, s in enumerate(series):
+                buffer[:, i] = s.data
+                s._data = buffer[:, i]
+            self._buffers[typ] = (buffer, list(self.components), [s._data for s in series])
+        return self
+
+    def _buffer(self, typ):
+        # The packed array of series type `typ`, if its columns are
+        # still the data of the components
+        if typ not in getattr(self, "_buffers", {}):
+            return None
+        buffer, keys, views = self._buffers[typ]
+        if list(self.components) != keys or any(
+            getattr(c, typ, None) is None or getattr(c, typ)._data is not view
+                for c, view in zip(self.components.values(), views)
+        ):
+            del self._buffers[typ]
+            return None
+        return buffer
+
+    def _stacked(self, typ):
+        buffer = self._buffer(typ)
+        if buffer is not None:
+            return buffer
+        return np.stack(tuple(getattr(c, typ) for c in self.components.values())).T
+
+    def _packed_operation(self, other, ufunc):
+        # Apply `ufunc` to the packed arrays of `self` and `other`, or
+        # return None if either motion is not packed, or if the result
+        # would not have the components given by the unpacked operation
+        if not isinstance(other, QuakeMotion):
+            return None
+        shared = [dirn for dirn in DIRECTIONS if dirn in self.components and dirn in other.components]
+        if list(self.components) != shared or list(other.components) != shared:
+            return None
+        result = {}
+        for typ in ("accel", "veloc", "displ"):
+            a, b = self._buffer(typ), other._buffer(typ)
+            if a is None or b is None or a.shape != b.shape:
+                return None
+            result[typ] = ufunc(a, b)
+
+        ret = copy(self)
+        ret.components = {}
+        for i, dirn in enumerate(self.components):
+            component = copy(self.components[dirn])
+            for typ, buffer in result.items():
+                series = copy(getattr(self.components[dirn], typ))
+                series._loader = None
+                series._data = buffer[:, i]
+                series._parent = component
+                setattr(component, typ, series._refresh())
+            ret.components[dirn] = component
+        for typ, buffer in result.items():
+            ret._buffers[typ] = (
+                buffer, list(ret.components), [getattr(c, typ)._data for c in ret.components.values()]
+            )
+        return ret
+
+    def __copy__(self):
+        # Packed arrays belong to the components of this motion, so a
+        # copy starts unpacked
+        ret = self.__class__.__new__(self.__class__)
+        ret.__dict__.update(self.__dict__)
+        dict.update(ret, self)
+        ret._buffers = {}
+        return ret
 
     def __repr__(self):
         #return f"QuakeMotion({dict.__repr__(self)})"
         return f"QuakeMotion({dict.__repr__(self)})"
 
     def __sub__(self, other):
+        ret = self._packed_operation(other, np.subtract)
+        if ret is not None:
+            return ret
         ret = copy(self)
         ret.components = {}
         for dirn in DIRECTIONS:
@@ -177,6 +378,9 @@ class QuakeMotion(dict):
         return ret
 
     def __add__(self, other):
+        ret = self._packed_operation(other, np.add)
+        if ret is not None:
+            return ret
         ret = copy(self)
         ret.components = {}
         for dirn in DIRECTIONS:
@@ -221,11 +425,18 @@ class QuakeMotion(dict):
 
         try:
             for attr in ["accel", "veloc", "displ"]:
-                x = getattr(self.components["long"], attr).data
-                y = getattr(self.components["tran"], attr).data
-                X = np.array([x, y])
-                x[:] = np.dot(rx, X)
-                y[:] = np.dot(ry, X)
+                buffer = self._buffer(attr)
+                if buffer is not None:
+                    i = [list(self.components).index(dirn) for dirn in ("long", "tran")]
+                    buffer[:, i] = buffer[:, i] @ np.array([rx, ry]).T
+                else:
+                    x = getattr(self.components["long"], attr).data
+                    y = getattr(self.components["tran"], attr).data
+                    X = np.array([x, y])
+                    x[:] = np.dot(rx, X)
+                    y[:] = np.dot(ry, X)
+                for dirn in ("long", "tran"):
+                    getattr(self.components[dirn], attr)._modified()
 
         except KeyError as e:
             raise AttributeError("Attempt to rotate a motion that"\
@@ -233,10 +444,89 @@ class QuakeMotion(dict):
 
         return self
 
+    def rotd(self, percentiles=(50, 100), periods=None, damping=0.05, angles: int = 180, **kwds) -> dict:
+        """
+        Compute the RotD spectra of the horizontal (`long` and `tran`)
+        acceleration, returning a dict mapping each of `percentiles` to
+        an array of shape (dampings, periods). The spectral value at
+        each of `angles` evenly spaced orientations in [0, 180) degrees
+        is the peak of the rotated oscillator response; RotD50 is
+        their median and RotD100 their maximum.
+
+        Because the oscillators are linear, their responses to the two
+        components are computed once (see
+        `quakeio.response.response_history`, to which `kwds` are
+        passed) and each rotation is a linear combination of them. The
+        motion is not modified.
+        """
+        peaks = self._rotated_peaks(periods, damping, angles, **kwds)
+        return {p: np.percentile(peaks, p, axis=0) for p in percentiles}
+
+    def gmroti50(self, periods=None, damping=0.05, **kwds) -> np.ndarray:
+        """
+        Compute the GMRotI50 spectrum (Boore et al., 2006) of the
+        horizontal acceleration: the geometric mean spectrum of the
+        single orientation whose geometric means are, on average over
+        `periods`, closest to their median over all orientations.
+        Returns an array of shape (dampings, periods).
+        """
+        peaks = self._rotated_peaks(periods, damping, 180, **kwds)
+        mean = np.sqrt(peaks[:90]*peaks[90:])
+        penalty = np.mean((mean/np.median(mean, axis=0) - 1)**2, axis=-1)
+        return np.take_along_axis(mean, np.argmin(penalty, axis=0)[None, :, None], axis=0)[0]
+
+    def _rotated_peaks(self, periods, damping, angles, **kwds):
+        # Peak response at each of `angles` orientations, with shape
+        # (angles, dampings, periods)
+        from scipy.spatial import ConvexHull
+        try:
+            from scipy.spatial import QhullError
+        except ImportError:
+            # Only exported from scipy.spatial since scipy 1.8
+            from scipy.spatial.qhull import QhullError
+        from quakeio.response import response_history
+
+        if periods is None:
+            periods = np.arange(0.02, 1.0, 0.01)
+        long, tran = self.long.accel, self.tran.accel
+        if long["time_step"] != tran["time_step"]:
+            raise ValueError("Expected horizontal components with the same time step")
+        n = min(len(long.data), len(tran.data))
+        history, _ = response_history(
+            np.stack([long.data[:n], tran.data[:n]]), long["time_step"], periods, damping, **kwds
+        )
+
+        theta = np.arange(angles)*np.pi/angles
+        rotation = np.stack([np.cos(theta), np.sin(theta)], axis=1)
+        peaks = np.empty((angles, *history.shape[1:3]))
+        for index in np.ndindex(*history.shape[1:3]):
+            response = history[(slice(None), *index)]
+            # The peak in any direction is reached at a vertex of the
+            # convex hull of the response trajectory, so the other
+            # samples do not need to be rotated
+            try:
+                response = response[:, ConvexHull(response.T).vertices]
+            except QhullError:
+                pass
+            peaks[(slice(None), *index)] = np.abs(rotation @ response).max(axis=-1)
+        return peaks
+
     def resultant(self):
         # initialize
         series = {k:None for k in ("accel", "veloc", "displ")}
         for typ in series:
+            buffer = self._buffer(typ)
+            if buffer is not None:
+                columns = [
+                    i for i, (dirn, c) in enumerate(self.components.items())
+                        if dirn in self.directions and c
+                ]
+                first = getattr(self.components[list(self.components)[columns[0]]], typ)
+                series[typ] = QuakeSeries(
+                    np.sqrt(np.einsum("ij,ij->i", buffer[:, columns], buffer[:, columns])),
+                    meta=first, time_zero=first.time_zero
+                )._refresh()
+                continue
             try:
                 series[typ] = np.sqrt(sum(
                     np.power(getattr(self.components[dirn],typ), 2)
@@ -308,12 +598,15 @@ class QuakeComponent(dict):
     schema_dir = Path(__file__).parents[2] / "etc/schemas"
     schema_file = schema_dir / "component.schema.json"
 
-    def __init__(self, accel, veloc, displ, motion=None, meta=None):
+    def __init__(self, accel, veloc, displ, motion=None, meta=None, spectra=None):
         meta = meta if meta is not None else {}
         self.accel = accel
         self.displ = displ
         self.veloc = veloc
         self._parent = motion
+        # Response spectra provided with the record (eg, from a
+        # CSMIP V3 file); see `quakeio.csmip.read_record_v3`.
+        self.spectra = spectra
 
         if not any(i is not None for i in (accel, veloc, displ)):
             raise ValueError("One of accel, veloc or displ must be non-None")
@@ -335,6 +628,33 @@ class QuakeComponent(dict):
         else:
             return f"QuakeComponent({self['component']}, " + ", ".join(repr(getattr(self, s, False)) or "" for s in ("accel", "veloc", "displ")) + ")"
 
+    def intensity_measures(self, threshold: float = 0.05) -> dict:
+        """
+        Compute the intensity measures of the acceleration of this
+        component (see `quakeio.intensity.intensity_measures`), using
+        the recorded velocity and displacement for the peak values
+        when they are available. Times are on the time axis of the
+        acceleration series.
+        """
+        from quakeio.intensity import intensity_measures
+
+        accel = self.accel
+        series = {
+            s: getattr(self, s).data for s in ("veloc", "displ")
+                if getattr(self, s) is not None and len(getattr(self, s).data) == len(accel.data)
+        }
+        return self._intensity_measures(intensity_measures(
+            accel.data, accel["time_step"], g=_gravity(accel),
+            threshold=threshold, **series
+        ))
+
+    def _intensity_measures(self, measures):
+        t0 = self.accel.time_zero
+        return {
+            k: v + t0 if k.endswith("_time") else (v if k == "husid" else float(v))
+                for k, v in measures.items()
+        }
+
     def find_components(self):
         loc = self["location_name"]
         for comp in self._parent.components.values():
@@ -377,46 +697,165 @@ class QuakeComponent(dict):
 
 
 
-    def __sub__(self, other):
+    # Arithmetic is applied to each of the accel, veloc and displ
+    # series that are present; see `QuakeSeries` for the operator model.
+    def _binary(self, op, other, reflected=False):
+        if not isinstance(other, QuakeComponent) and not np.isscalar(other):
+            return NotImplemented
         ret = copy(self)
-        if isinstance(other, QuakeComponent):
-            for k in ["accel", "veloc", "displ"]:
-                setattr(ret, k, getattr(other, k) - getattr(self, k))
-
-        elif isinstance(other, (float, int)):
-            for k in ["accel", "veloc", "displ"]:
-                setattr(ret, k, other - getattr(self, k))
+        for k in ["accel", "veloc", "displ"]:
+            operands = self._operands(other, k)
+            if operands is None:
+                # Series missing from either operand are missing from
+                # the result, which shares no data with its operands
+                setattr(ret, k, None)
+                continue
+            a, b = operands
+            series = op(b, a) if reflected else op(a, b)
+            series._parent = ret
+            setattr(ret, k, series)
         return ret
 
+    def _inplace(self, op, other):
+        if not isinstance(other, QuakeComponent) and not np.isscalar(other):
+            return NotImplemented
+        for k in ["accel", "veloc", "displ"]:
+            operands = self._operands(other, k)
+            if operands is not None:
+                op(*operands)
+        return self
+
+    def _operands(self, other, k):
+        # The series `k` of `self` and `other`, or None if either is
+        # missing or their lengths differ
+        a = getattr(self, k, None)
+        if not isinstance(other, QuakeComponent):
+            return None if a is None else (a, other)
+        b = getattr(other, k, None)
+        if a is None or b is None or len(a.data) != len(b.data):
+            return None
+        return a, b
+
     def __add__(self, other):
-        ret = copy(self)
-        if isinstance(other, QuakeComponent):
-            for k in ["accel", "veloc", "displ"]:
-                setattr(ret, k, getattr(other, k) + getattr(self, k))
+        return self._binary(operator.add, other)
 
-        elif isinstance(other, (float, int)):
-            for k in ["accel", "veloc", "displ"]:
-                setattr(ret, k, other + getattr(self, k))
-        return ret
+    def __sub__(self, other):
+        return self._binary(operator.sub, other)
 
     def __mul__(self, other):
-        ret = copy(self)
-        if isinstance(other, QuakeComponent):
-            for k in ["accel", "veloc", "displ"]:
-                setattr(ret, k, getattr(other, k) * getattr(self, k))
-        elif isinstance(other, (float, int)):
-            for k in ["accel", "veloc", "displ"]:
-                setattr(ret, k,  other * getattr(self, k))
-        return ret
-
-    def __rsub__(self, other):
-        return self.__sub__(other)
+        return self._binary(operator.mul, other)
 
     def __radd__(self, other):
-        return self.__add__(other)
+        return self._binary(operator.add, other, reflected=True)
+
+    def __rsub__(self, other):
+        return self._binary(operator.sub, other, reflected=True)
 
     def __rmul__(self, other):
-        return self.__mul__(other)
+        return self._binary(operator.mul, other, reflected=True)
+
+    def __iadd__(self, other):
+        return self._inplace(operator.iadd, other)
+
+    def __isub__(self, other):
+        return self._inplace(operator.isub, other)
+
+    def __imul__(self, other):
+        return self._inplace(operator.imul, other)
+
+
+class TimeAxis(np.lib.mixins.NDArrayOperatorsMixin):
+    """
+    The times `t0 + i*dt` of `n` evenly spaced samples.
+
+    Single times, slices (which are again a `TimeAxis`) and
+    `searchsorted` are computed from `t0`, `dt` and `n`; the array of
+    times is only built when it is requested (eg, by `np.asarray`).
+    Arrays are shared by all axes with the same sampling and kept for
+    reuse up to a total of `TIME_AXIS_CACHE_BYTES`. Use `time_axis` to
+    share one axis between all series with the same sampling.
+    """
+    def __init__(self, t0: float, dt: float, n: int):
+        self.t0 = float(t0)
+        self.dt = float(dt)
+        self.n = int(n)
+
+    def __repr__(self):
+        return f"TimeAxis(t0={self.t0}, dt={self.dt}, n={self.n})"
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        return iter(np.asarray(self))
+
+    def __eq__(self, other):
+        if isinstance(other, TimeAxis):
+            return (self.t0, self.dt, self.n) == (other.t0, other.dt, other.n)
+        return np.asarray(self) == other
+
+    def __hash__(self):
+        return hash((self.t0, self.dt, self.n))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            index = range(self.n)[key]
+            return TimeAxis(self.t0 + index.start*self.dt, index.step*self.dt, len(index))
+        if isinstance(key, (int, np.integer)):
+            return self.t0 + range(self.n)[key]*self.dt
+        return np.asarray(self)[key]
+
+    def __array__(self, dtype=None):
+        key = (self.t0, self.dt, self.n)
+        array = _time_arrays.get(key)
+        if array is None:
+            array = self.t0 + np.arange(self.n)*self.dt
+            array.flags.writeable = False
+            if array.nbytes <= TIME_AXIS_CACHE_BYTES:
+                _time_arrays[key] = array
+                while sum(a.nbytes for a in _time_arrays.values()) > TIME_AXIS_CACHE_BYTES:
+                    _time_arrays.popitem(last=False)
+        else:
+            _time_arrays.move_to_end(key)
+        return array if dtype is None else array.astype(dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwds):
+        inputs = [np.asarray(i) if isinstance(i, TimeAxis) else i for i in inputs]
+        return getattr(ufunc, method)(*inputs, **kwds)
+
+    def searchsorted(self, t, side: str = "left"):
+        """
+        Return the indices at which the times `t` would be inserted to
+        keep the axis sorted, as `np.searchsorted(np.asarray(self), t,
+        side)` but without building the array of times.
+        """
+        t = np.asarray(t, dtype=float)
+        if self.n == 0:
+            return np.zeros(t.shape, dtype=int)[()]
+        x = (t - self.t0)/self.dt
+        i = np.clip(np.ceil(x) if side == "left" else np.floor(x) + 1, 0, self.n).astype(int)
+        # Correct for rounding in the division
+        if side == "left":
+            i -= (i > 0) & (self.t0 + (i - 1)*self.dt >= t)
+            i += (i < self.n) & (self.t0 + i*self.dt < t)
+        else:
+            i -= (i > 0) & (self.t0 + (i - 1)*self.dt > t)
+            i += (i < self.n) & (self.t0 + i*self.dt <= t)
+        return i[()]
+
+
+# Arrays of times built by `TimeAxis`, in order of last use
+_time_arrays = OrderedDict()
+
+
+@lru_cache(maxsize=TIME_AXIS_CACHE_SIZE)
+def time_axis(t0: float, dt: float, n: int) -> TimeAxis:
+    """
+    Return the `TimeAxis` of `n` samples at time step `dt` starting at
+    `t0`. Axes are cached, so all series of a collection with the same
+    sampling share one axis, and at most one array of times.
+    """
+    return TimeAxis(t0, dt, n)
 
 
 class QuakeSeries(dict):
@@ -427,22 +866,31 @@ class QuakeSeries(dict):
             return res
         return wrapped
 
-    def __init__(self, input_array, dt=None, meta=None, time_zero=0.0, **kwds):
-        self._data = np.asarray(input_array)
-        assert len(self.data.shape) == 1
+    def __init__(self, input_array, dt=None, meta=None, time_zero=0.0, loader=None, **kwds):
+        # When a `loader` is given, `input_array` may be None and the
+        # data is only read the first time it is accessed.
+        self._loader = loader
+        if input_array is None and loader is not None:
+            self._data = None
+        else:
+            self._data = np.asarray(input_array)
+            assert len(self.data.shape) == 1
         self.update(meta if meta is not None else {})
         self.update(kwds)
-        self._time = None
         self.time_zero = time_zero
         if dt is not None:
             self.time_step = self["time_step"] = dt
-        if "peak_value" not in self:
+        if "peak_value" not in self and self._data is not None:
             self._refresh()
 
     def __getitem__(self, key):
         try:
             return dict.__getitem__(self,key)
         except KeyError as e:
+            if key == "peak_value" and self._data is None and self._loader is not None:
+                # Loading deferred data sets its peak value
+                self.data
+                return dict.__getitem__(self, key)
             if hasattr(self, "_parent"):
                 return self._parent[key]
             else:
@@ -450,13 +898,119 @@ class QuakeSeries(dict):
 
     def _refresh(self):
         if len(self.data) > 0:
-            self["peak_value"] = max(self.data, key=abs)
+            self["peak_value"] = self.peak_value
         return self
 
+    @property
+    def _data(self):
+        return self.__dict__.get("_array", None)
+
+    @_data.setter
+    def _data(self, data):
+        self.__dict__["_array"] = data
+        self._modified()
+
+    def _modified(self):
+        # Invalidate the statistics of the data; called when the data is
+        # replaced, and after it is changed in place
+        self._version = getattr(self, "_version", 0) + 1
+
+    def modified(self):
+        """
+        Record that the data was changed in place outside of the
+        operators of this class (eg, `series.data[:] = ...` or
+        `np.multiply(series.data, 2, out=series.data)`), so that
+        `peak_value` and the other statistics are computed again.
+        """
+        self._modified()
+        return self._refresh()
+
+    def _statistics(self):
+        # Peak statistics of the data, computed with a few reductions
+        # and kept until the data version changes
+        cached = getattr(self, "_stats", None)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+
+        data = self.data
+        if len(data) == 0:
+            stats = dict.fromkeys(("peak_index", "peak_value", "rms", "min_value", "max_value"))
+        else:
+            low, high = int(np.argmin(data)), int(np.argmax(data))
+            # As for max(data, key=abs), ties go to the first sample
+            if -data[low] > data[high] or (-data[low] == data[high] and low < high):
+                peak = low
+            else:
+                peak = high
+            stats = dict(
+                peak_index = peak,
+                peak_value = data[peak].item(),
+                rms = float(np.sqrt(np.dot(data, data)/len(data))),
+                min_value = data[low].item(),
+                max_value = data[high].item(),
+            )
+        self._stats = (self._version, stats)
+        return stats
+
+    @property
+    def peak_value(self):
+        """The sample of largest magnitude, or None if there is no data."""
+        return self._statistics()["peak_value"]
+
+    @property
+    def peak_time(self):
+        """The time of `peak_value`."""
+        index = self._statistics()["peak_index"]
+        if index is None:
+            return None
+        return self.time_zero + index*self["time_step"]
+
+    @property
+    def rms(self):
+        """The root mean square of the data."""
+        return self._statistics()["rms"]
+
+    @property
+    def min_value(self):
+        return self._statistics()["min_value"]
+
+    @property
+    def max_value(self):
+        return self._statistics()["max_value"]
+
     @property
     def data(self):
+        """
+        The array of values. Statistics such as `peak_value` are cached
+        until the data changes: assigning a new array to `data`, and the
+        arithmetic operators of the series, update them, but after
+        writing into the array directly, `modified` must be called.
+        """
+        if self._data is None and self._loader is not None:
+            self._data = np.asarray(self._loader())
+            if "peak_value" not in self:
+                self._refresh()
         return self._data
 
+    @data.setter
+    def data(self, data):
+        self._data = np.asarray(data)
+        assert len(self._data.shape) == 1
+        self._refresh()
+
+    @property
+    def loaded(self):
+        return self._data is not None
+
+    def unload(self):
+        """
+        Release the data of a lazily loaded series; it is read
+        again the next time it is accessed.
+        """
+        if self._loader is not None:
+            self._data = None
+        return self
+
     def __repr__(self):
         try:
             filename=hex(id(self))
@@ -476,87 +1030,150 @@ class QuakeSeries(dict):
             attributes.update({"data": list(self.data)})
         return attributes
 
-    @_update_metadata
-    def __pow__(self, other):
-        ret = copy(self)
-        ret._data = np.power(ret.data, other)
-        return ret
-
-    @_update_metadata
-    def __sub__(self, other):
+    # Arithmetic
+    #
+    # Binary operators allocate a single array for their result, which
+    # carries the metadata of the left operand; in-place operators
+    # write into the data of the series, and so into any array of
+    # which it is a view (see `QuakeMotion.pack`). Chains of operations
+    # can avoid temporaries by passing `out=` to numpy ufuncs, eg
+    # `np.subtract(top, bot, out=drift)`.
+    def _binary(self, ufunc, *operands):
+        if not all(_is_operand(x) for x in operands):
+            return NotImplemented
         ret = copy(self)
-        if isinstance(other, QuakeSeries):
-            ret._data = other.data - self.data
+        ret._loader = None
+        ret._data = ufunc(*(_values(x) for x in operands))
+        return ret._refresh()
 
-        elif isinstance(other, (float, int)):
-            ret._data = other - self.data
-        return ret
+    def _inplace(self, ufunc, other):
+        if not _is_operand(other):
+            return NotImplemented
+        ufunc(self.data, _values(other), out=self.data)
+        self._modified()
+        return self._refresh()
 
-    @_update_metadata
     def __add__(self, other):
-        ret = copy(self)
-        if isinstance(other, QuakeSeries):
-            ret._data += other.data
+        return self._binary(np.add, self, other)
 
-        elif isinstance(other, (float, int)):
-            ret._data += other
-        return ret
+    def __sub__(self, other):
+        return self._binary(np.subtract, self, other)
 
-    @_update_metadata
     def __mul__(self, other):
-        if isinstance(other, (float, int)):
-            ret = copy(self)
-            ret._data *= other
-        else:
-            raise TypeError()
-        return ret
+        return self._binary(np.multiply, self, other)
+
+    def __truediv__(self, other):
+        return self._binary(np.true_divide, self, other)
+
+    def __pow__(self, other):
+        return self._binary(np.power, self, other)
+
+    def __radd__(self, other):
+        return self._binary(np.add, other, self)
+
+    def __rsub__(self, other):
+        return self._binary(np.subtract, other, self)
+
+    def __rmul__(self, other):
+        return self._binary(np.multiply, other, self)
+
+    def __rtruediv__(self, other):
+        return self._binary(np.true_divide, other, self)
+
+    def __neg__(self):
+        return self._binary(np.negative, self)
+
+    def __iadd__(self, other):
+        return self._inplace(np.add, other)
+
+    def __isub__(self, other):
+        return self._inplace(np.subtract, other)
+
+    def __imul__(self, other):
+        return self._inplace(np.multiply, other)
+
+    def __itruediv__(self, other):
+        return self._inplace(np.true_divide, other)
 
     @_update_metadata
     def sqrt(self, inplace=False):
         ret = copy(self)
-        out = self._data if inplace else None
-        ret._data = np.sqrt(self._data, out=out)
+        out = self.data if inplace else None
+        ret._data = np.sqrt(self.data, out=out)
+        if inplace:
+            self._modified()
         return ret
 
     def __array__(self,dtype=None):
-        return self._data
-    
-    def __array_ufunc__(self, ufunc, method, *inputs, **kwds):
-        if method=="__call__":
-            inputs = [i.data if isinstance(i,self.__class__) else i for i in inputs]
-            return self.__class__(ufunc(*inputs, **kwds),meta=self,time_zero=self.time_zero)._refresh()
-    
-    def __rsub__(self, other):
-        return self.__sub__(other)
-    
-    def __radd__(self, other):
-        return self.__add__(other)
-
-    def __rmul__(self, other):
-        return self.__mul__(other)
+        return self.data
+
+    def __array_ufunc__(self, ufunc, method, *inputs, out=None, **kwds):
+        if out is not None:
+            kwds["out"] = tuple(_values(x) for x in out)
+        result = getattr(ufunc, method)(*(_values(x) for x in inputs), **kwds)
+
+        # Series written to by the ufunc
+        written = [x for x in (out or ()) if isinstance(x, QuakeSeries)]
+        if method == "at" and isinstance(inputs[0], QuakeSeries):
+            written.append(inputs[0])
+        for series in written:
+            series._modified()
+            series._refresh()
+
+        if out is not None:
+            return out[0] if len(out) == 1 else out
+        if method != "__call__":
+            return result
+        if isinstance(result, tuple):
+            return tuple(self.__class__(r, meta=self, time_zero=self.time_zero)._refresh() for r in result)
+        return self.__class__(result, meta=self, time_zero=self.time_zero)._refresh()
 
     @property
-    def time(self):
-        if self._time is None:
-            dt = self["time_step"]
-            t0 = self.time_zero
-            self._time = np.arange(t0,t0+dt*len(self.data),dt)
-        return self._time
+    def time(self) -> TimeAxis:
+        # The length of deferred data is taken from its header, if given,
+        # so that it is not loaded
+        if self._data is None and "shape" in self:
+            n = int(self["shape"])
+        else:
+            n = len(self.data)
+        return time_axis(float(self.time_zero), float(self["time_step"]), n)
 
     def slice(self,*args):
         time = self.time
-        idx = (args[0] < time) & (time < args[1])
-        self._time = time[idx]
-        self.time_zero = self._time[0]
-        self._data = self.data[idx]
+        first = time.searchsorted(args[0], side="right")
+        last = time.searchsorted(args[1], side="left")
+        self.time_zero = time[first]
+        self._data = self.data[first:last]
         return self
 
+    def window(self, start=None, end=None):
+        """
+        Return a new series holding the samples of this series at times
+        between `start` and `end` (inclusive). When the data is loaded
+        lazily from a source that supports slicing (eg, a `quake.chunked`
+        archive), only the requested samples are read and this series is
+        not loaded.
+        """
+        dt, t0 = self["time_step"], self.time_zero
+        source = self._loader if self._data is None and hasattr(self._loader, "__getitem__") \
+                 else self.data
+        size = len(source)
+
+        first = 0 if start is None else max(0, int(np.ceil((start - t0)/dt - 1e-9)))
+        last  = size if end is None else min(size, int(np.floor((end - t0)/dt + 1e-9)) + 1)
+
+        meta = {k: v for k, v in self.items() if k not in ("peak_value", "peak_time")}
+        ret = self.__class__(source[first:max(first, last)], meta=meta, time_zero=t0 + first*dt)
+        if hasattr(self, "_parent"):
+            ret._parent = self._parent
+        return ret
+
     def plot(self, ax=None, fig=None, label=None, index=(None,), scale=1.0, **kwds):
         # matplotlib takes a very long time to import; avoid
         # loading at module level.
         import matplotlib.pyplot as plt
         idx = slice(*index)
-        time = self.time
+        time = np.asarray(self.time)
 
         if ax is None:
             fig, ax = plt.subplots()
@@ -571,6 +1188,28 @@ class QuakeSeries(dict):
 
 
 
+def _gravity(accel):
+    # Acceleration of gravity in the units of the series `accel`, or NaN
+    # (with a warning) when they are missing or unknown, so that the
+    # measures that do not depend on them can still be computed
+    from quakeio.intensity import gravity
+    try:
+        return gravity(accel["units"])
+    except KeyError:
+        warnings.warn("Acceleration series has no units; measures relative to gravity are NaN")
+    except ValueError as e:
+        warnings.warn(f"{e}; measures relative to gravity are NaN")
+    return np.nan
+
+
+def _is_operand(value):
+    return isinstance(value, (QuakeSeries, np.ndarray)) or np.isscalar(value)
+
+
+def _values(value):
+    return value.data if isinstance(value, QuakeSeries) else value
+
+
 def rotate(data, angle):
     #output = copy(data)
     if isinstance(data, QuakeComponent):
@@ -0,0 +1,176 @@
+# Claudio Perez
+"""
+Fourier analysis of recorded channels.
+
+Transfer functions between channels are estimated from Welch averages
+of cross- and auto-spectral densities: each channel is divided into
+overlapping, windowed segments whose rfft is computed once, and the
+densities of every input/output pair are averaged from these.
+
+Spectra are smoothed with the window of Konno and Ohmachi (1998),
+applied as a sparse matrix that is cached for each frequency grid and
+bandwidth.
+"""
+from functools import lru_cache
+
+import numpy as np
+import scipy.fft
+import scipy.signal
+import scipy.sparse
+
+# Number of lobes on each side of the center of the Konno-Ohmachi
+# window that are kept; the weights beyond are below 1e-4
+KONNO_OHMACHI_LOBES = 3
+
+# Number of smoothing matrices kept by `konno_ohmachi`
+SMOOTHING_CACHE_SIZE = 16
+
+
+def welch_segments(channels, nperseg: int, noverlap: int = None, window="hann"):
+    """
+    Return the rfft of the overlapping, windowed and detrended segments
+    of each row of `channels`, with shape (channels, segments,
+    frequencies), and the window that was applied.
+    """
+    channels = np.atleast_2d(np.asarray(channels, dtype=float))
+    noverlap = nperseg//2 if noverlap is None else noverlap
+    if not 0 <= noverlap < nperseg <= channels.shape[1]:
+        raise ValueError("Expected 0 <= noverlap < nperseg <= number of samples")
+
+    win = scipy.signal.get_window(window, nperseg)
+    segments = np.lib.stride_tricks.sliding_window_view(channels, nperseg, axis=-1)[:, ::nperseg - noverlap]
+    segments = segments - segments.mean(axis=-1, keepdims=True)
+    return scipy.fft.rfft(segments*win, axis=-1), win
+
+
+def transfer_functions(channels, pairs, dt: float, nperseg: int = None, noverlap: int = None,
+                       window="hann", smoothing: float = None) -> dict:
+    """
+    Estimate the transfer function from the input to the output channel
+    of each pair `(i, j)` in `pairs`, where `i` and `j` index the rows
+    of `channels`, sampled at time step `dt`.
+
+    Segments have `nperseg` samples (by default, the largest power of
+    two no greater than an eighth of the record) and overlap by
+    `noverlap` (by default, half a segment). Returns a dict with the
+    arrays
+
+    - "frequency": frequencies in Hz
+    - "amplitude", "phase": of the H1 estimate Pxy/Pxx, with one row
+      per pair
+    - "coherence": the magnitude squared coherence of each pair
+
+    If `smoothing` is given, the amplitudes are smoothed with the
+    Konno-Ohmachi window of that bandwidth (see `konno_ohmachi`).
+    """
+    channels = np.atleast_2d(np.asarray(channels, dtype=float))
+    if nperseg is None:
+        nperseg = min(channels.shape[1], 2**max(int(np.log2(max(channels.shape[1]//8, 1))), 4))
+
+    # Only the channels that appear in a pair are transformed, each once
+    used, index = np.unique(np.asarray(pairs, dtype=int).reshape(-1, 2), return_inverse=True)
+    index = index.reshape(-1, 2)
+    X, win = welch_segments(channels[used], nperseg, noverlap, window)
+
+    scale = np.full(X.shape[-1], 2*dt/np.sum(win**2))
+    scale[0] /= 2
+    if nperseg % 2 == 0:
+        scale[-1] /= 2
+
+    psd = np.mean(np.abs(X)**2, axis=1)*scale
+    csd = np.mean(np.conj(X[index[:, 0]])*X[index[:, 1]], axis=1)*scale
+
+    Pxx, Pyy = psd[index[:, 0]], psd[index[:, 1]]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        H = csd/Pxx
+        coherence = np.abs(csd)**2/(Pxx*Pyy)
+
+    frequency = scipy.fft.rfftfreq(nperseg, dt)
+    amplitude = np.abs(H)
+    if smoothing is not None:
+        amplitude = konno_ohmachi(np.nan_to_num(amplitude), frequency, smoothing)
+    return {
+        "frequency": frequency,
+        "amplitude": amplitude,
+        "phase": np.angle(H),
+        "coherence": coherence,
+    }
+
+
+def konno_ohmachi(spectra, frequency, bandwidth: float = 40.0, output=None) -> np.ndarray:
+    """
+    Smooth the amplitude spectra `spectra` (an array whose last axis
+    corresponds to `frequency`) with the Konno-Ohmachi window
+
+        W(f, fc) = (sin(b*log10(f/fc))/(b*log10(f/fc)))**4
+
+    where `b` is the `bandwidth`. The smoothed spectra are evaluated at
+    the frequencies `output` (by default, `frequency`), for example a
+    reduced grid such as `np.geomspace(frequency[1], frequency[-1], 200)`.
+    All spectra are smoothed by a single sparse matrix product (see
+    `konno_ohmachi_matrix`).
+    """
+    spectra = np.asarray(spectra, dtype=float)
+    frequency = np.asarray(frequency, dtype=float)
+    output = frequency if output is None else np.asarray(output, dtype=float)
+    W = _konno_ohmachi_matrix(frequency.tobytes(), float(bandwidth), output.tobytes())
+    smoothed = W @ spectra.reshape(-1, spectra.shape[-1]).T
+    return smoothed.T.reshape(*spectra.shape[:-1], len(output))
+
+
+def konno_ohmachi_matrix(frequency, bandwidth: float = 40.0, output=None):
+    """
+    Return the sparse matrix, with one row for each frequency in
+    `output` and one column for each frequency in `frequency`, that
+    applies the Konno-Ohmachi window. Each row is normalized to sum
+    to one and only holds the weights within `KONNO_OHMACHI_LOBES`
+    lobes of its center. Matrices are cached (see `smoothing_cache_info`).
+    """
+    frequency = np.asarray(frequency, dtype=float)
+    output = frequency if output is None else np.asarray(output, dtype=float)
+    return _konno_ohmachi_matrix(frequency.tobytes(), float(bandwidth), output.tobytes())
+
+
+@lru_cache(maxsize=SMOOTHING_CACHE_SIZE)
+def _konno_ohmachi_matrix(frequency: bytes, bandwidth: float, output: bytes):
+    frequency = np.frombuffer(frequency)
+    output = np.frombuffer(output)
+    if np.any(np.diff(frequency) <= 0):
+        raise ValueError("Expected increasing frequencies")
+
+    # Range of input frequencies within the kept lobes of each center
+    ratio = 10**(KONNO_OHMACHI_LOBES*np.pi/bandwidth)
+    lo = np.searchsorted(frequency, output/ratio, side="left")
+    hi = np.searchsorted(frequency, output*ratio, side="right")
+    # At a center of zero, only the zero frequency is weighted
+    zero = output <= 0.0
+    lo[zero] = np.searchsorted(frequency, 0.0)
+    hi[zero] = lo[zero] + 1
+
+    count = hi - lo
+    rows = np.repeat(np.arange(len(output)), count)
+    cols = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count - lo, count)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = bandwidth*np.log10(frequency[cols]/output[rows])
+        weights = (np.sin(x)/x)**4
+    weights[x == 0.0] = 1.0
+    weights[np.repeat(zero, count) | ~np.isfinite(weights)] = 0.0
+    weights[np.repeat(zero, count) & (frequency[cols] == 0.0)] = 1.0
+
+    # Normalize each row; rows are already in order, so the matrix is
+    # assembled directly in compressed sparse row form
+    indptr = np.concatenate([[0], np.cumsum(count)])
+    total = np.bincount(rows, weights, minlength=len(output))
+    total[total == 0.0] = 1.0
+    weights /= np.repeat(total, count)
+    weights.flags.writeable = False
+    return scipy.sparse.csr_matrix((weights, cols, indptr), shape=(len(output), len(frequency)))
+
+
+def smoothing_cache_info():
+    """
+    Return the hits, misses, maximum size and current size of the
+    cache of smoothing matrices.
+    """
+    return _konno_ohmachi_matrix.cache_info()
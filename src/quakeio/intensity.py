@@ -0,0 +1,120 @@
+# Claudio Perez
+"""
+Ground motion intensity measures.
+
+All measures of a stack of records are computed together from arrays
+whose last axis is time, and are returned in the units of the records;
+for example, the Arias intensity of a record in cm/sec/sec is in
+cm/sec.
+"""
+import numpy as np
+
+# Acceleration of gravity in the acceleration units used by the parsers
+GRAVITY = {
+    "g": 1.0,
+    "cm/sec/sec": 980.665,
+    "cm/sec2": 980.665,
+    "cm/s/s": 980.665,
+    "cm/s2": 980.665,
+    "m/sec/sec": 9.80665,
+    "m/s/s": 9.80665,
+    "m/s2": 9.80665,
+    "in/sec/sec": 386.0886,
+    "in/s/s": 386.0886,
+    "in/s2": 386.0886,
+}
+
+# Husid levels bounding the significant durations D5-75 and D5-95
+SIGNIFICANT_DURATIONS = {"d5_75": (0.05, 0.75), "d5_95": (0.05, 0.95)}
+
+
+def gravity(units: str) -> float:
+    """Return the acceleration of gravity in the acceleration `units`."""
+    try:
+        return GRAVITY[units.replace(" ", "").replace("^", "").lower()]
+    except KeyError:
+        raise ValueError(f"Unknown acceleration units '{units}'") from None
+
+
+def intensity_measures(accel, dt: float, g=GRAVITY["g"], threshold: float = 0.05,
+                       veloc=None, displ=None) -> dict:
+    """
+    Compute the intensity measures of the acceleration records `accel`
+    (an array whose last axis is time) sampled at time step `dt`. `g`
+    is the acceleration of gravity in the units of `accel`, and may be
+    an array with one entry per record. Velocity and displacement are
+    integrated from `accel` unless `veloc` and `displ` are given.
+    Where `g` is NaN (eg, the units of a record are unknown), the
+    measures that depend on it, "arias_intensity" and
+    "bracketed_duration", are NaN.
+
+    Returns a dict of arrays with the shape of `accel` less its last
+    axis, except "husid", the normalized Husid curve of each record:
+
+    - "arias_intensity": pi/(2g) times the integral of accel**2
+    - "cav": cumulative absolute velocity, the integral of |accel|
+    - "d5_75", "d5_95": significant durations between 5% and 75% or 95%
+      of the Arias intensity
+    - "bracketed_duration": time between the first and last exceedance
+      of `threshold` times `g`
+    - "pga", "pgv", "pgd": peak absolute values, and "pga_time",
+      "pgv_time", "pgd_time", the times at which they occur
+    """
+    accel = np.asarray(accel, dtype=float)
+    g = np.asarray(g, dtype=float)[..., None]
+    n = accel.shape[-1]
+
+    # Cumulative trapezoidal integrals of accel**2 and |accel|
+    square = accel**2
+    husid = np.zeros_like(accel)
+    np.cumsum((square[..., 1:] + square[..., :-1])*(dt/2), axis=-1, out=husid[..., 1:])
+    total = husid[..., -1:]
+    absolute = np.abs(accel)
+    cav = np.sum(absolute[..., 1:] + absolute[..., :-1], axis=-1)*(dt/2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        husid = np.where(total > 0.0, husid/total, 0.0)
+
+    measures = {
+        "arias_intensity": (np.pi/(2*g)*total)[..., 0],
+        "husid": husid,
+        "cav": cav,
+    }
+    times = {level: _crossing(husid, level, dt) for bounds in SIGNIFICANT_DURATIONS.values() for level in bounds}
+    for key, (start, end) in SIGNIFICANT_DURATIONS.items():
+        measures[key] = times[end] - times[start]
+
+    exceeds = absolute >= threshold*g
+    first = np.argmax(exceeds, axis=-1)
+    last = n - 1 - np.argmax(exceeds[..., ::-1], axis=-1)
+    measures["bracketed_duration"] = np.where(
+        np.isnan(g[..., 0]), np.nan, np.where(np.any(exceeds, axis=-1), (last - first)*dt, 0.0)
+    )
+
+    if veloc is None:
+        veloc = _integrate(accel, dt)
+    if displ is None:
+        displ = _integrate(np.asarray(veloc, dtype=float), dt)
+    for key, series in (("pga", absolute), ("pgv", veloc), ("pgd", displ)):
+        series = np.abs(series)
+        peak = np.argmax(series, axis=-1)
+        measures[key] = np.take_along_axis(series, peak[..., None], axis=-1)[..., 0]
+        measures[f"{key}_time"] = peak*dt
+    return measures
+
+
+def _integrate(series, dt):
+    integral = np.zeros_like(series)
+    np.cumsum((series[..., 1:] + series[..., :-1])*(dt/2), axis=-1, out=integral[..., 1:])
+    return integral
+
+
+def _crossing(husid, level, dt):
+    # Time at which each (non-decreasing) Husid curve reaches `level`,
+    # interpolated between samples
+    i = np.clip(np.sum(husid < level, axis=-1), 1, husid.shape[-1] - 1)[..., None]
+    h0 = np.take_along_axis(husid, i - 1, axis=-1)
+    h1 = np.take_along_axis(husid, i, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(h1 > h0, (level - h0)/(h1 - h0), 0.0)
+    return ((i - 1 + np.clip(fraction, 0.0, 1.0))*dt)[..., 0]
@@ -0,0 +1,126 @@
+# Claudio Perez
+"""
+Compact storage for large suites of single-component records, such as
+the NGA records considered during ground motion selection.
+"""
+import json
+
+import numpy as np
+
+from quakeio.core import QuakeSeries
+from quakeio.parse.basic_formats import QuakeEncoder, LIBRARY_HEADER, load_npz
+
+
+class QuakeLibrary:
+    """
+    A library of records packed into a single ragged buffer.
+
+    The values of all records are concatenated in the 1-D array `data`;
+    record `i` spans `data[offsets[i]:offsets[i+1]]`. The time step of
+    each record is held in the array `time_step`, and any other
+    metadata in `meta`, a dict of columns with one entry per record.
+    Records are accessed by position or by name as `QuakeSeries` views
+    of `data`, so no values are copied.
+    """
+    def __init__(self, data, offsets, time_step, names=None, meta=None, peak_value=None):
+        self.data = np.asarray(data)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.time_step = np.asarray(time_step, dtype=float)
+        self.names = list(names) if names is not None else [str(i) for i in range(len(self))]
+        self.meta = {k: list(v) for k, v in (meta or {}).items()}
+        self._index = {}
+        for i, name in enumerate(self.names):
+            self._index.setdefault(name, i)
+
+        if len(self.offsets) != len(self.time_step) + 1 or len(self.names) != len(self.time_step):
+            raise ValueError("Expected one offset, time step and name for each record")
+        if any(len(v) != len(self) for v in self.meta.values()):
+            raise ValueError("Expected one metadata entry for each record")
+
+        # Peak values of all records, in one pass over the buffer
+        if peak_value is None:
+            peak_value = np.zeros(len(self))
+            nonempty = np.diff(self.offsets) > 0
+            if np.any(nonempty):
+                starts = self.offsets[:-1][nonempty]
+                high = np.maximum.reduceat(self.data, starts)
+                low  = np.minimum.reduceat(self.data, starts)
+                peak_value[nonempty] = np.where(-low > high, low, high)
+        self.peak_value = np.asarray(peak_value, dtype=float)
+
+    def __len__(self):
+        return len(self.time_step)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __repr__(self):
+        return f"QuakeLibrary({len(self)} records, {len(self.data)} values)"
+
+    def index(self, name) -> int:
+        return self._index[name]
+
+    def record(self, key) -> np.ndarray:
+        """Return a view of the values of record `key` (a position or name)."""
+        i = self._index[key] if isinstance(key, str) else range(len(self))[key]
+        return self.data[self.offsets[i]:self.offsets[i+1]]
+
+    def __getitem__(self, key) -> QuakeSeries:
+        i = self._index[key] if isinstance(key, str) else range(len(self))[key]
+        meta = {k: v[i] for k, v in self.meta.items()}
+        meta.update(name=self.names[i], peak_value=self.peak_value[i])
+        return QuakeSeries(self.record(i), dt=float(self.time_step[i]), meta=meta)
+
+    @classmethod
+    def from_series(cls, series, names=None):
+        """
+        Pack a sequence of `QuakeSeries`. The metadata keys of the first
+        series become the metadata columns of the library.
+        """
+        series = list(series)
+        keys = [k for k in (series[0] if series else {}) if k not in ("time_step", "peak_value", "name")]
+        lengths = [len(s.data) for s in series]
+        return cls(
+            np.concatenate([s.data for s in series]) if series else np.empty(0),
+            np.concatenate([[0], np.cumsum(lengths)]),
+            [s["time_step"] for s in series],
+            names=names,
+            meta={k: [s.get(k, None) for s in series] for k in keys}
+        )
+
+    def save(self, write_file):
+        """
+        Save the library to a single uncompressed `.npz` file which can
+        be memory-mapped by `QuakeLibrary.load`.
+        """
+        header = json.dumps({"names": self.names, "meta": self.meta}, cls=QuakeEncoder)
+        np.savez(
+            write_file,
+            data=self.data,
+            offsets=self.offsets,
+            time_step=self.time_step,
+            peak_value=self.peak_value,
+            **{LIBRARY_HEADER: np.frombuffer(header.encode("utf-8"), dtype=np.uint8)}
+        )
+
+    @classmethod
+    def load(cls, read_file, mmap_mode=None):
+        """
+        Load a library saved by `QuakeLibrary.save`. If `mmap_mode` is
+        given (eg, "r"), the record values are memory-mapped rather
+        than read into memory. `quakeio.read` also loads libraries.
+        """
+        arrays = load_npz(read_file, mmap_mode)
+        if LIBRARY_HEADER not in arrays:
+            raise ValueError(f"{read_file} is not a library saved by QuakeLibrary.save")
+        return cls.from_arrays(arrays)
+
+    @classmethod
+    def from_arrays(cls, arrays: dict):
+        header = json.loads(arrays[LIBRARY_HEADER].tobytes().decode("utf-8"))
+        return cls(arrays["data"], arrays["offsets"], arrays["time_step"],
+                   peak_value=arrays["peak_value"], **header)
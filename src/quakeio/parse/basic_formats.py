@@ -2,7 +2,9 @@ import json
 from copy import copy
 from pathlib import Path
 
-from quakeio.core import QuakeComponent, QuakeCollection, QuakeSeries
+import numpy as np
+
+from quakeio.core import QuakeComponent, QuakeCollection, QuakeMotion, QuakeSeries
 from quakeio.utils.parseutils import open_quake
 
 
@@ -25,12 +27,173 @@ def write_text(write_file, ground_motion, **kwds):
         numpy.savetxt(f, accel, fmt="%.8f", delimiter="\n")
 
 
+# Name of the member of a quake.npz archive that holds the
+# hierarchy and metadata of the archived object.
+NPZ_HEADER = "__quakeio__"
+
+# Name of the member that holds the metadata of a saved
+# `quakeio.library.QuakeLibrary`, which is also a .npz archive.
+LIBRARY_HEADER = "__quakeio_library__"
+
 class QuakeEncoder(json.JSONEncoder):
     def default(self, obj):
         if hasattr(obj, "tolist"):
             return obj.tolist()
         return json.JSONEncoder.default(self, obj)
 
+def _pack_value(value, arrays: list):
+    if isinstance(value, np.ndarray):
+        arrays.append(value)
+        return {"__array__": len(arrays) - 1}
+    elif isinstance(value, dict):
+        return {k: _pack_value(v, arrays) for k, v in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_pack_value(v, arrays) for v in value]
+    return value
+
+def _unpack_value(value, arrays):
+    if isinstance(value, dict):
+        if "__array__" in value:
+            array = arrays[value["__array__"]]
+            return array() if callable(array) else array
+        return {k: _unpack_value(v, arrays) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_unpack_value(v, arrays) for v in value]
+    return value
+
+def pack_arrays(ground_motion):
+    """
+    Split a `QuakeCollection`, `QuakeMotion`, `QuakeComponent` or
+    `QuakeSeries` into a JSON-serializable skeleton that holds the
+    hierarchy and all metadata, and the list of numpy arrays (series
+    data and spectra) that the skeleton refers to by index.
+    """
+    arrays = []
+
+    def pack(obj):
+        if obj is None:
+            return None
+        meta = _pack_value(dict(obj), arrays)
+        if isinstance(obj, QuakeCollection):
+            return {"type": "QuakeCollection", "meta": meta, "event_date": obj.event_date,
+                    "motions": {k: pack(m) for k, m in obj.motions.items()}}
+        elif isinstance(obj, QuakeMotion):
+            return {"type": "QuakeMotion", "meta": meta,
+                    "components": {k: pack(c) for k, c in obj.components.items()}}
+        elif isinstance(obj, QuakeComponent):
+            return {"type": "QuakeComponent", "meta": meta,
+                    "series": {s: pack(getattr(obj, s, None)) for s in ("accel", "veloc", "displ")},
+                    "spectra": _pack_value(obj.spectra, arrays)}
+        elif isinstance(obj, QuakeSeries):
+            arrays.append(np.asarray(obj.data))
+            return {"type": "QuakeSeries", "meta": meta, "time_zero": obj.time_zero,
+                    "data": len(arrays) - 1}
+        raise TypeError(f"Cannot pack object of type `{type(obj)}`")
+
+    return pack(ground_motion), arrays
+
+def unpack_arrays(skeleton: dict, arrays):
+    """
+    Rebuild the object packed by `pack_arrays`; `arrays` may be any
+    sequence or mapping from the indices in `skeleton` to arrays. An
+    entry of `arrays` may also be a loader that returns the array when
+    called, in which case series data is loaded lazily.
+    """
+    if skeleton is None:
+        return None
+
+    typ  = skeleton["type"]
+    meta = _unpack_value(skeleton["meta"], arrays)
+    if typ == "QuakeCollection":
+        motions = {k: unpack_arrays(m, arrays) for k, m in skeleton["motions"].items()}
+        return QuakeCollection(motions, event_date=skeleton["event_date"], meta=meta)
+    elif typ == "QuakeMotion":
+        components = {k: unpack_arrays(c, arrays) for k, c in skeleton["components"].items()}
+        return QuakeMotion(components, meta=meta)
+    elif typ == "QuakeComponent":
+        series = [unpack_arrays(skeleton["series"][s], arrays) for s in ("accel", "veloc", "displ")]
+        return QuakeComponent(*series, meta=meta,
+                              spectra=_unpack_value(skeleton["spectra"], arrays))
+    elif typ == "QuakeSeries":
+        data = arrays[skeleton["data"]]
+        if callable(data):
+            return QuakeSeries(None, meta=meta, time_zero=skeleton["time_zero"], loader=data)
+        return QuakeSeries(data, meta=meta, time_zero=skeleton["time_zero"])
+    raise ValueError(f"Unknown type `{typ}`")
+
+def write_npz(write_file, ground_motion, compress=False, **kwds):
+    """
+    Write `ground_motion` to a `.npz` archive in which each array is
+    stored as its own `.npy` member, and the hierarchy and metadata are
+    stored as JSON in the member `__quakeio__`. Unless `compress` is
+    True, members are stored uncompressed so that they can be
+    memory-mapped by `read_npz`.
+    """
+    skeleton, arrays = pack_arrays(ground_motion)
+    header = json.dumps(skeleton, cls=QuakeEncoder).encode("utf-8")
+    members = {str(i): np.ascontiguousarray(a) for i, a in enumerate(arrays)}
+    members[NPZ_HEADER] = np.frombuffer(header, dtype=np.uint8)
+    (np.savez_compressed if compress else np.savez)(write_file, **members)
+
+def read_npz(read_file, mmap_mode=None, **kwds: Unused):
+    """
+    Read an archive written by `write_npz`. If `mmap_mode` is given
+    (eg, "r" or "c"), the arrays of uncompressed members are
+    memory-mapped from the archive rather than read into memory.
+    """
+    arrays = load_npz(read_file, mmap_mode)
+    if LIBRARY_HEADER in arrays:
+        from quakeio.library import QuakeLibrary
+        return QuakeLibrary.from_arrays(arrays)
+    if NPZ_HEADER not in arrays:
+        raise ValueError(f"{read_file} was not written by quakeio (no member '{NPZ_HEADER}')")
+
+    skeleton = json.loads(arrays.pop(NPZ_HEADER).tobytes().decode("utf-8"))
+    return unpack_arrays(skeleton, [arrays[str(i)] for i in range(len(arrays))])
+
+def load_npz(read_file, mmap_mode=None) -> dict:
+    """
+    Return a dict mapping the name of each member of the `.npz` archive
+    `read_file` to its array. If `mmap_mode` is given (eg, "r" or "c"),
+    the arrays of uncompressed members are memory-mapped from the
+    archive rather than read into memory.
+    """
+    if mmap_mode is None:
+        with np.load(read_file, allow_pickle=False) as f:
+            return {k: f[k] for k in f.files}
+    return _mmap_npz(read_file, mmap_mode)
+
+def _mmap_npz(read_file, mmap_mode):
+    import struct
+    import zipfile
+    arrays = {}
+    with zipfile.ZipFile(read_file) as archive, open(read_file, "rb") as f:
+        for info in archive.infolist():
+            name = info.filename[:-4]
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member, allow_pickle=False)
+                continue
+
+            # Skip the local file header to find the start of the .npy data
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = struct.unpack("<HH", f.read(4))
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+
+            if dtype.hasobject:
+                raise ValueError(f"Member {info.filename} of {read_file} holds Python objects")
+            elif np.prod(shape) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(f, dtype=dtype, mode=mmap_mode, offset=f.tell(),
+                                         shape=shape, order="F" if fortran else "C")
+    return arrays
+
 def read_basic(data:dict):
     if "motions" in data:
         for motion in data["motions"]:
@@ -85,4 +248,5 @@ FILE_TYPES = {
     "yaml": {"read": read_yaml, "write": write_yaml},
     "quake.json": {"read": read_json, "write": write_json},
     "quake.yaml": {"read": read_yaml, "write": write_yaml},
+    "quake.npz":  {"read": read_npz,  "write": write_npz},
 }
@@ -0,0 +1,146 @@
+# Claudio Perez
+"""
+Chunked, compressed archive format (`quake.chunked`) for long,
+continuous records.
+
+Each array (series data and spectra) is split into chunks of a fixed
+number of values which are compressed independently with zlib. An
+archive has the layout:
+
+    b"QUAKECHK"           magic
+    <u8                   byte offset of the header
+    chunks ...            compressed chunks of every array
+    header                JSON
+
+where the header holds the hierarchy and metadata of the archived
+object (see `basic_formats.pack_arrays`) and, for each array, its
+dtype, shape, chunk size and the byte offsets of its chunks.
+
+Series read from an archive are loaded lazily, and
+`QuakeSeries.window` decompresses only the chunks that overlap the
+requested window.
+"""
+import json
+import zlib
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from quakeio.parse.basic_formats import pack_arrays, unpack_arrays, QuakeEncoder
+
+MAGIC = b"QUAKECHK"
+# Default number of values in each chunk
+CHUNK_SIZE = 2**16
+
+
+class ChunkedArray:
+    """
+    An array stored as a sequence of compressed chunks in the archive
+    `file`. Calling the array decompresses all of it; indexing a 1-D
+    array with a slice decompresses only the chunks that the slice
+    touches.
+
+    Like `DeferredData`, instances only hold the path of the archive
+    and can be pickled.
+    """
+    def __init__(self, file, dtype, shape, chunk_size: int, offsets: list):
+        self.file = str(file)
+        self.dtype = np.dtype(dtype)
+        self.shape = tuple(shape)
+        self.chunk_size = chunk_size
+        self.offsets = offsets
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __call__(self):
+        return self._read(0, int(np.prod(self.shape))).reshape(self.shape)
+
+    def __getitem__(self, index):
+        if len(self.shape) != 1:
+            return self()[index]
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step < 0:
+                return self()[index]
+            return self._read(start, max(start, stop))[::step]
+        i = index + len(self) if index < 0 else index
+        if not 0 <= i < len(self):
+            raise IndexError(f"index {index} is out of bounds for size {len(self)}")
+        return self._read(i, i + 1)[0]
+
+    def _read(self, start: int, stop: int):
+        if stop <= start:
+            return np.empty(0, dtype=self.dtype)
+        first = start // self.chunk_size
+        last  = (stop - 1) // self.chunk_size
+        with open(self.file, "rb") as f:
+            f.seek(self.offsets[first])
+            buffer = f.read(self.offsets[last + 1] - self.offsets[first])
+
+        base = self.offsets[first]
+        data = np.frombuffer(b"".join(
+            zlib.decompress(buffer[self.offsets[i] - base:self.offsets[i + 1] - base])
+                for i in range(first, last + 1)
+        ), dtype=self.dtype)
+        offset = first*self.chunk_size
+        # Copy, so that the result is writable and the chunks are released
+        return data[start - offset:stop - offset].copy()
+
+    def __repr__(self):
+        return f"ChunkedArray({self.file}, {self.dtype}, {self.shape})"
+
+
+def write_chunked(write_file, ground_motion, chunk_size: int = CHUNK_SIZE, level: int = 6, **kwds):
+    """
+    Write `ground_motion` to a chunked archive. Each array is split
+    into chunks of `chunk_size` values that are compressed with zlib at
+    compression `level`.
+    """
+    skeleton, arrays = pack_arrays(ground_motion)
+
+    index = []
+    with open(write_file, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", 0))
+        for array in arrays:
+            if array.dtype.hasobject:
+                raise TypeError(f"Cannot write array of type {array.dtype}")
+            values  = np.ascontiguousarray(array).reshape(-1)
+            offsets = [f.tell()]
+            for i in range(0, len(values), chunk_size):
+                f.write(zlib.compress(values[i:i + chunk_size].tobytes(), level))
+                offsets.append(f.tell())
+            index.append({
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "chunk_size": chunk_size,
+                "offsets": offsets
+            })
+
+        header = f.tell()
+        f.write(json.dumps({"arrays": index, "data": skeleton}, cls=QuakeEncoder).encode("utf-8"))
+        f.seek(len(MAGIC))
+        f.write(struct.pack("<Q", header))
+
+
+def read_chunked(read_file, **kwds):
+    """
+    Read an archive written by `write_chunked`. No series data is
+    decompressed until it is accessed (see `QuakeSeries.window`).
+    """
+    with open(read_file, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{read_file} is not a quake.chunked archive")
+        header, = struct.unpack("<Q", f.read(8))
+        f.seek(header)
+        header = json.loads(f.read().decode("utf-8"))
+
+    read_file = Path(read_file).resolve()
+    arrays = [ChunkedArray(read_file, **array) for array in header["arrays"]]
+    return unpack_arrays(header["data"], arrays)
+
+
+FILE_TYPES = {
+    "quake.chunked": {"read": read_chunked, "write": write_chunked}
+}
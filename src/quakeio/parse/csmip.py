@@ -5,11 +5,12 @@ Parse a CSMIP strong motion data file.
 """
 import re
 import sys
-import fnmatch
 import zipfile
 from datetime import datetime
 from pathlib import Path
+from functools import partial, lru_cache
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 
@@ -21,8 +22,11 @@ from quakeio.core import (
 )
 
 from quakeio.utils.parseutils import (
-    parse_sequential_fields,
-    open_quake,
+    HeaderParser,
+    read_buffer,
+    read_lines,
+    read_fixed_width,
+    DeferredData,
     RE_DECIMAL,  # Regular expression for extracting decimal values
     RE_UNITS,    # Regular expression for extracting units
     CRE_WHITE,
@@ -30,10 +34,13 @@ from quakeio.utils.parseutils import (
 )
 
 re_digits = re.compile(r"([0-9]+)")
+# Fortran edit descriptor for a block of data, eg "(8f10.6)"
+RE_DATA_FORMAT = re.compile(r"\(([0-9]*)[fe]([0-9]+)\.[0-9]+\)", re.IGNORECASE)
 
 # Module constants
 NUM_COLUMNS = 8
 HEADER_END_LINE = 45
+V1_HEADER_END_LINE = 27
 
 INTEGER_HEADER_START_LINE = 25
 INTEGER_HEADER_END_LINE = 25+7
@@ -166,6 +173,30 @@ HEADER_FIELDS = {
 }
 # fmt: on
 
+# Lines on which fields are found in the fixed layout of the V2 text
+# header. These fields are read directly from their line; the remaining
+# fields, like the date and the counts of velocity and displacement
+# data, float and are searched for.
+V2_HEADER_LINES = {
+    ("_", "record.record_identifier"): 1,
+    ("record.station.no", "record.station.coord"): 6,
+    ("record.channel", "record.component", "_", "record.station_channel", "record.location_name"): 8,
+    ("record.instr_period", ".units"): 11,
+    ("accel.peak_value", "accel.units", "accel.peak_time"): 18,
+    ("veloc.peak_value", "veloc.units", "veloc.peak_time"): 19,
+    ("displ.peak_value", "displ.units", "displ.peak_time"): 20,
+    ("record.init_veloc", ".units", "record.init_displ", ".units"): 21,
+    ("accel.shape", "accel.time_step"): 46,
+}
+
+def _pin_fields(fields, lines):
+    return {
+        key: (typs, (lines[key], pat)) if key in lines else (typs, pat)
+        for key, (typs, pat) in fields.items()
+    }
+
+V2_HEADER_FIELDS = _pin_fields(HEADER_FIELDS, V2_HEADER_LINES)
+
 V1_HEADER_FIELDS = HEADER_FIELDS.copy()
 V1_HEADER_FIELDS.update({
     ("record.station_name",): ((words, ),
@@ -173,32 +204,81 @@ V1_HEADER_FIELDS.update({
     )
 })
 
-def read_event(read_file, verbosity=0, summarize=False, **kwds):
+# The V3 text header has one more line at the top than the V2 header
+V3_HEADER_FIELDS = _pin_fields(HEADER_FIELDS, {
+    key: line + 1 for key, line in V2_HEADER_LINES.items()
+})
+V3_HEADER_FIELDS.update({
+    ("record.station_name",): ((words, ),
+        ( 8,  (slice(40),) )
+    )
+})
+
+def read_event(read_file, verbosity=0, summarize=False, workers=None, executor=None, lazy=False,
+               spectra=False, **kwds):
     """
     Take the name of a CSMIP zip file and extract record data for the event.
 
     - kwds are passed to read_motion_v2
+    - When `workers` is greater than one, archive members are parsed
+      by a pool of `workers` processes, each of which opens the archive
+      itself. Alternatively, an existing `concurrent.futures.Executor`
+      may be passed as `executor`. In either case results are merged
+      in archive order, so the output is identical to a serial read.
+    - When `lazy` is True, only the headers of each member are parsed;
+      series data is decoded from the archive the first time it is
+      accessed, and can be released with `QuakeSeries.unload()`.
+    - When `spectra` is True, the response spectra in each V3 file are
+      attached to the component read from the V2 file of the same
+      channel (see `read_record_v3`).
     """
 
-    components = []
     zippath    = Path(read_file)
     archive    = zipfile.ZipFile(zippath)
     motions    = defaultdict(QuakeMotion)
 
+    # Disregard any files that are not V1 or V2
+    members = [
+        file for file in archive.namelist()
+            if file.endswith((".v2", ".V2", ".v1", ".V1"))
+    ]
+
+    # Match V3 files to the V2 file of the same channel
+    if spectra:
+        v3_files = {
+            _make_key(file.rsplit(".", 1)[0]): file for file in archive.namelist()
+                if file.endswith((".v3", ".V3"))
+        }
+        spectra_files = [v3_files.get(_make_key(file.rsplit(".", 1)[0]), None) for file in members]
+    else:
+        spectra_files = [None]*len(members)
+
+    options = dict(verbosity=verbosity, summarize=summarize, lazy=lazy, **kwds)
+    if executor is None and (workers is None or workers <= 1):
+        records = (
+            _read_member(file, v3, archive, **options)
+                for file, v3 in zip(members, spectra_files)
+        )
+    else:
+        pool = executor if executor is not None else ProcessPoolExecutor(workers)
+        try:
+            records = list(pool.map(
+                partial(_read_member, archive=str(zippath), **options), members, spectra_files
+            ))
+        finally:
+            if executor is None:
+                pool.shutdown()
+
     v1 = False
+    # Total number of bytes decompressed from the archive
+    nbytes = 0
 
     # Loop over V1 and V2 files in the zipped archive
-    for file in archive.namelist():
-        # Disregard any files that are not V1 or V2
-        if not file.endswith((".v2", ".V2", ".v1", ".V1")):
-            continue
-
-        # Optional info logging
-        if verbosity > 2: print(f"\t\t{file}", file=sys.stderr)
+    for file, (cmp, size) in zip(members, records):
+        nbytes += size
 
         v1 = True if file.endswith((".v1", ".V1")) else False
 
-        cmp = read_record_v2(file, archive, verbosity=verbosity, summarize=summarize, v1=v1, **kwds)
         loc = _make_key(cmp.get("location_name", str(file)))
         drn = _make_key(cmp.get("component", "NA"))
 
@@ -211,15 +291,21 @@ def read_event(read_file, verbosity=0, summarize=False, **kwds):
         motions[loc]["key"] = loc
         motions[loc].components[drn] = cmp
 
+    if verbosity > 1:
+        print(f"\t{zippath.name}: decompressed {nbytes} bytes", file=sys.stderr)
 
     # EVENT-LEVEL METADATA
     # Compute peak values over the entire archive.
     # --------------------------------------------
     # V1 files may not give peak values for the individual files (components), 
-    # so in this case they are computed manually.
-    if v1 and not summarize:
+    # so in this case they are computed manually. When the data is read
+    # lazily, the peak is unknown until it is loaded, and is left out.
+    if v1 and lazy:
+        peak_accel = None
+
+    elif v1 and not summarize:
         peak_accel = max(
-            (max(c.accel.data, key=abs) for m in motions.values() for c in m.components.values()),
+            (c.accel.peak_value for m in motions.values() for c in m.components.values()),
             key=abs
         )
 
@@ -244,12 +330,63 @@ def read_event(read_file, verbosity=0, summarize=False, **kwds):
         "record_identifier": first_component.get("record_identifier", "NA"),
         "station_number":    first_component.get("station.no", "NA")
     }
+    if peak_accel is None:
+        del metadata["peak_accel"]
     return QuakeCollection(dict(motions), event_date=date, meta=metadata)
 
 
+def _read_member(file, spectra_file=None, archive=None, verbosity=0, lazy=False, **kwds):
+    """
+    Read a single V1 or V2 member of a CSMIP archive and return the
+    component along with the number of bytes that were decompressed.
+    `archive` is either an open `zipfile.ZipFile`, or the path to one
+    which is then opened here (eg, by a worker process). If given,
+    `spectra_file` names a V3 member whose spectra are attached to
+    the component.
+    """
+    if not isinstance(archive, zipfile.ZipFile):
+        with zipfile.ZipFile(archive) as archive:
+            return _read_member(file, spectra_file, archive, verbosity=verbosity, lazy=lazy, **kwds)
+
+    v1 = True if file.endswith((".v1", ".V1")) else False
+
+    # Each member is decompressed exactly once; when lazy, only
+    # as far as the end of its headers.
+    if lazy:
+        header_lines = V1_HEADER_END_LINE if v1 else HEADER_END_LINE
+        buffer = b"".join(read_lines(file, header_lines + 1, archive))
+    else:
+        buffer = read_buffer(file, archive)
+
+    # Optional info logging
+    if verbosity > 2: print(f"\t\t{file} ({len(buffer)} bytes)", file=sys.stderr)
+
+    cmp = read_record_v2(file, archive, verbosity=verbosity, v1=v1, buffer=buffer,
+                         lazy=lazy, **kwds)
+    nbytes = len(buffer)
+
+    if spectra_file is not None:
+        buffer  = read_buffer(spectra_file, archive)
+        nbytes += len(buffer)
+        if verbosity > 2: print(f"\t\t{spectra_file} ({len(buffer)} bytes)", file=sys.stderr)
+        cmp.spectra = read_record_v3(spectra_file, archive, verbosity=verbosity, buffer=buffer).spectra
+
+    return cmp, nbytes
+
+
 # Fields that are not provided in the V1 format.
 V1_EXCLUDE = ("filter*", "*peak*", "*init*", "*disp*", "*velo*")
 
+# Fields that are not provided in the V3 format.
+V3_EXCLUDE = ("filter*", "*peak*", "*init*", "accel.*", "veloc.*", "displ.*")
+# Line on which the V3 text header ends; the first line
+# of the V3 format names the spectra that follow.
+V3_TEXT_HEADER_END_LINE = 30
+# Number of values in each block of V3 spectral data
+V3_BLOCK_SIZE = 100
+# Order in which the response spectra are given for each damping value
+V3_SPECTRA = ("sd", "sv", "sa", "pssv", "sd_time", "sv_time", "sa_time")
+
 
 def read_record_v2(
     read_file,
@@ -258,126 +395,79 @@ def read_record_v2(
     summarize: bool =False,
     v1: bool = False,
     exclusions: tuple = (),
+    buffer: bytes = None,
+    lazy: bool = False,
     **kwds
 ) -> QuakeComponent:
     """
     Read a ground motion record using the CSMIP Volume 2 format
+
+    If `buffer` is given, it holds the contents of `read_file` and
+    the file is not opened again. If `lazy` is True, only the headers
+    are parsed and each series is given a `DeferredData` loader that
+    decodes the data from the file when it is first accessed; in this
+    case `buffer` need only contain the headers.
     """
     if v1:
         exclusions = V1_EXCLUDE
-        FIELDS = V1_HEADER_FIELDS
-    else:
-        FIELDS = HEADER_FIELDS
 
     filename = Path(read_file)
+    header_end = V1_HEADER_END_LINE if v1 else HEADER_END_LINE
 
-    # 1. PARSE READABLE HEADER (Regular expressions)
-    # Collect keys to exclude
-    keys = []
-    for x in exclusions:
-        for k in FIELDS:
-            if any(fnmatch.fnmatch(kk,x) for kk in k):
-                keys.append(k)
-
-    header_fields = {k: v for k,v in FIELDS.items() if k not in keys}
-
-    # Parse header fields
-    try:
-        with open_quake(read_file, "r", archive) as f:
-            header_data = parse_sequential_fields(f, header_fields, verbose=verbosity)
-        header_data.pop("_")
-    except:
-        if verbosity:
-            print("Failed to parse header data for file {filename.name}", file=sys.stderr)
-        header_data = {}
+    # Decompress (or read) the file once; all of the parse stages
+    # below operate on this buffer.
+    if buffer is None and lazy:
+        buffer = b"".join(read_lines(read_file, header_end + 1, archive))
+    elif buffer is None:
+        buffer = read_buffer(read_file, archive)
+    lines = buffer.splitlines(keepends=True)
 
+    # 1. PARSE READABLE HEADER (Regular expressions)
+    header_data = _parse_text_header(buffer, "v1" if v1 else "v2", exclusions, filename, verbosity)
 
     # 2. PARSE NUMERIC HEADERS
-    # Reopen and parse out data; Note, only the first call
-    # provides a skip_header argument as successive reads
+    # Skip the text header; note that successive reads
     # pick up where the previous left off.
-    with open_quake(read_file, "r", archive) as f:
-        # 50 integer values spanning 7 lines between lines 26-32
-        int_header = np.genfromtxt(
-            f,
-            dtype=int,
-            skip_header=13 if v1 else 25,
-            max_rows=6,
-            delimiter=5,
-            ).flatten()
-        int_header = np.append(int_header , np.genfromtxt(
-            f,
-            dtype=int,
-            max_rows=1,
-            delimiter=5,
-            ).flatten()
-        )
-        assert len(int_header) == 100, int_header[:5]
-
-        # 100 floating point values on lines 33-45
-        real_header = np.genfromtxt(
-            f,
-            max_rows= 27-21 if v1 else 45-33,
-            delimiter=10,
-        ).flatten()
-        real_header = np.append(real_header , np.genfromtxt(
-            f,
-            max_rows=1,
-            delimiter=10,
-            ).flatten()
-        )
+    f = iter(lines[13 if v1 else 25:])
 
-        assert len(real_header) == (50 if v1 else 100)
-
-        # Clean and process numeric header data, setup for parse stage 3.
-        num_header = _process_numeric_headers_v2(int_header, real_header, header_data)
-        # extract information about shape of data
-        s = next(f)
-        s = s if isinstance(s, str) else s.decode("utf-8")
-        len_accel = int(re.match("^ *([0-9]*) *.*", s).group(1))
-        # extract format specifier, eg "(8f9.6)" if provided
-        data_fmt = re.match(r"\(8f(.*)\)", s)
-        if data_fmt:
-            field_width = int(data_fmt.group(1).split(".")[0])
-        else:
-            field_width = 9 if v1 else 10
+    # 100 integer values spanning 7 lines between lines 26-32
+    int_header = read_fixed_width(f, 100, 5, 16, dtype=int)
 
-        parse_options = dict(
-            delimiter = field_width,  # fields are 10 chars wide
-            dtype=float,
-        )
+    # 100 floating point values on lines 33-45
+    real_header = read_fixed_width(f, 50 if v1 else 100, 10, NUM_COLUMNS)
 
-        # 3. PARSE OUT SENSOR DATA
-        # Note that successive file reads will begin where we left off
-        if not summarize:
-            accel = np.genfromtxt(
-                f,
-                # skip_header=HEADER_END_LINE + 1,
-                max_rows=np.ceil(len_accel/NUM_COLUMNS) - 1,
-                **parse_options,
-            ).flatten()
-            accel = np.append(accel, np.genfromtxt(f,max_rows=1,**parse_options))
-            if not v1:
-                s = next(f)
-                s = s if isinstance(s, str) else s.decode("utf-8")
-                len_veloc = int(re.match("^ *([0-9]*)", s).group(0))
-                veloc = np.genfromtxt(
-                    f, max_rows=np.ceil(len_veloc/NUM_COLUMNS)-1, **parse_options
-                ).flatten()
-                veloc = np.append(veloc, np.genfromtxt(f,max_rows=1,**parse_options))
-
-                s = next(f)
-                s = s if isinstance(s, str) else s.decode("utf-8")
-                len_displ = int(re.match("^ *([0-9]*)", s).group(0))
-                displ = np.genfromtxt(
-                    f, max_rows=np.ceil(len_displ/NUM_COLUMNS)-1, **parse_options
-                ).flatten()
-                displ = np.append(displ, np.genfromtxt(f,max_rows=1,**parse_options))
-            else:
-                veloc, displ = [], []
-        else:
-            accel, veloc, displ = [], [], []
+    # Clean and process numeric header data, setup for parse stage 3.
+    num_header = _process_numeric_headers_v2(int_header, real_header, header_data)
 
+    # 3. PARSE OUT SENSOR DATA
+    default_width = 9 if v1 else 10
+    loaders = {}
+    if lazy and not summarize:
+        # Defer reading data; record where the data blocks begin.
+        offset = sum(map(len, lines[:header_end]))
+        if archive is not None:
+            source = dict(archive=Path(archive.filename).resolve())
+        else:
+            source = dict(archive=None)
+            read_file = Path(read_file).resolve()
+
+        for block, typ in enumerate(("accel",) if v1 else ("accel", "veloc", "displ")):
+            decode = partial(_decode_data, block=block, default_width=default_width)
+            loaders[typ] = DeferredData(read_file, offset, decode, **source)
+
+        accel, veloc, displ = None, None, None
+        if v1:
+            veloc, displ = [], []
+
+    elif not summarize:
+        accel = _read_data_block(f, default_width)
+        if not v1:
+            veloc = _read_data_block(f, default_width)
+            displ = _read_data_block(f, default_width)
+        else:
+            veloc, displ = [], []
+    else:
+        accel, veloc, displ = [], [], []
 
 
     # Treat metadata
@@ -407,6 +497,14 @@ def read_record_v2(
 
     record_data["file_name"] = filename.name
 
+    if lazy and not v1:
+        # The veloc and displ blocks are not read until they are needed;
+        # CSMIP V2 blocks share the shape and time step of the accel block.
+        for typ in "veloc", "displ":
+            for key in "shape", "time_step":
+                if key in series_data["accel"]:
+                    series_data[typ].setdefault(key, series_data["accel"][key])
+
     if "station_channel" not in record_data or not record_data["station_channel"]:
     	record_data["station_channel"] = str(int(re_digits.search(filename.name.split(".")[0]).group(0)))
 
@@ -423,12 +521,159 @@ def read_record_v2(
     # record_data["ihdr"] = list(int_header)
     # record_data["rhdr"] = list(real_header)
     return QuakeComponent(
-        QuakeSeries(accel, meta=series_data["accel"]),
-        QuakeSeries(veloc, meta=series_data["veloc"]),
-        QuakeSeries(displ, meta=series_data["displ"]),
+        QuakeSeries(accel, meta=series_data["accel"], loader=loaders.get("accel")),
+        QuakeSeries(veloc, meta=series_data["veloc"], loader=loaders.get("veloc")),
+        QuakeSeries(displ, meta=series_data["displ"], loader=loaders.get("displ")),
         meta=record_data,
     )
 
+def read_record_v3(
+    read_file,
+    archive: zipfile.ZipFile = None,
+    verbosity: int  = 0,
+    exclusions: tuple = (),
+    buffer: bytes = None,
+    **kwds
+) -> QuakeComponent:
+    """
+    Read the response and Fourier amplitude spectra computed by the
+    agency from a CSMIP Volume 3 file.
+
+    The returned component has empty series, and its `spectra`
+    attribute holds a dict with the arrays `period` and `damping`,
+    the 2-D (period x damping) arrays `sd`, `sv`, `sa` and `pssv` along
+    with the times at which the peaks `sd_time`, `sv_time`, `sa_time`
+    occur, and the Fourier amplitude spectrum `fourier` at each period.
+    """
+    filename = Path(read_file)
+    if buffer is None:
+        buffer = read_buffer(read_file, archive)
+    lines = buffer.splitlines(keepends=True)
+
+    # 1. PARSE READABLE HEADER (Regular expressions)
+    header_data = _parse_text_header(
+        buffer, "v3", (*V3_EXCLUDE, *exclusions), filename, verbosity
+    )
+    record_data = {
+        key.split(".", 1)[1]: val for key, val in header_data.items()
+            if key.startswith("record.")
+    }
+    record_data["file_name"] = filename.name
+    if not record_data.get("station_channel", None):
+        record_data["station_channel"] = str(int(re_digits.search(filename.name.split(".")[0]).group(0)))
+
+    # 2. PARSE NUMERIC HEADERS
+    f = iter(lines[V3_TEXT_HEADER_END_LINE:])
+    int_header  = read_fixed_width(f, 100, 5, 16, dtype=int)
+    # None of the 100 real header values are used; skip their rows
+    for _ in range(-(-100 // NUM_COLUMNS)):
+        next(f)
+    num_period  = int_header[68 - 1]
+    num_damping = int_header[69 - 1]
+
+    # 3. PARSE SPECTRA
+    # Each block holds V3_BLOCK_SIZE values, of which the
+    # first `num_period` are used.
+    damping = read_fixed_width(f, num_damping, 10, NUM_COLUMNS)
+    period  = read_fixed_width(f, V3_BLOCK_SIZE, 10, NUM_COLUMNS)[:num_period]
+
+    # "Fourier amplitude spectra in in/sec."
+    next(f)
+    fourier = read_fixed_width(f, V3_BLOCK_SIZE, 10, NUM_COLUMNS)[:num_period]
+
+    response = np.empty((len(V3_SPECTRA), num_period, num_damping))
+    for j in range(num_damping):
+        # "Damping = 0.05. Data of Sd,Sv,Sa,Pssv,ttSd,ttSv,ttSa :"
+        next(f)
+        for i in range(len(V3_SPECTRA)):
+            response[i,:,j] = read_fixed_width(f, V3_BLOCK_SIZE, 10, NUM_COLUMNS)[:num_period]
+
+    spectra = dict(period=period, damping=damping, fourier=fourier)
+    spectra.update(zip(V3_SPECTRA, response))
+
+    # Unit system of the spectra; Sa is always a fraction of g.
+    units = "cm" if any(b"Units for spectra are cm" in line for line in lines[:V3_TEXT_HEADER_END_LINE]) else "in"
+    spectra["units"] = {
+        "period":  "sec",
+        "fourier": f"{units}/sec",
+        "sd":      units,
+        "sv":      f"{units}/sec",
+        "pssv":    f"{units}/sec",
+        "sa":      "g",
+    }
+
+    return QuakeComponent(
+        QuakeSeries([]),
+        QuakeSeries([]),
+        QuakeSeries([]),
+        meta=record_data,
+        spectra=spectra
+    )
+
+
+@lru_cache(maxsize=None)
+def _header_parser(version: str, exclusions: tuple = ()) -> HeaderParser:
+    """
+    Return the header parser for the CSMIP format `version` ("v1", "v2"
+    or "v3") without the fields matched by `exclusions`. Each parser is
+    compiled once and reused for every file.
+    """
+    FIELDS = {"v1": V1_HEADER_FIELDS, "v2": V2_HEADER_FIELDS, "v3": V3_HEADER_FIELDS}[version]
+    return HeaderParser(FIELDS, exclusions)
+
+
+def _parse_text_header(buffer, version, exclusions, filename, verbosity=0):
+    # Parse header fields
+    try:
+        header_data = _header_parser(version, tuple(exclusions))(buffer, verbose=verbosity)
+        header_data.pop("_")
+    except:
+        if verbosity:
+            print(f"Failed to parse header data for file {filename.name}", file=sys.stderr)
+        header_data = {}
+
+    return header_data
+
+
+def _parse_data_format(line, default_width: int = 10):
+    """
+    Parse the line preceding a block of sensor data, eg:
+
+        13000 points of accel data equally spaced at 0.005 sec, in cm/sec2. (8f10.6)
+
+    and return the number of values in the block, the number of values
+    per row, and the width of each value. When the line does not carry
+    a format specifier, `NUM_COLUMNS` values of `default_width` are assumed.
+    """
+    line = line if isinstance(line, str) else line.decode("utf-8")
+    count = int(re_digits.search(line).group(1))
+    data_fmt = RE_DATA_FORMAT.search(line)
+    if data_fmt:
+        columns = int(data_fmt.group(1) or 1)
+        width   = int(data_fmt.group(2))
+    else:
+        columns, width = NUM_COLUMNS, default_width
+    return count, columns, width
+
+
+def _read_data_block(f, default_width: int = 10):
+    count, columns, width = _parse_data_format(next(f), default_width)
+    return read_fixed_width(f, count, width, columns)
+
+
+def _decode_data(data: bytes, block: int = 0, default_width: int = 10):
+    """
+    Decode the `block`-th block of sensor data (0: accel, 1: veloc,
+    2: displ) from `data`, which begins with the first block.
+    """
+    f = iter(data.splitlines(keepends=True))
+    for _ in range(block):
+        count, columns, _ = _parse_data_format(next(f), default_width)
+        for _ in range(-(-count // columns)):
+            next(f)
+    return _read_data_block(f, default_width)
+
+
 def _process_numeric_headers_v2(ihdr, rhdr, txthdr):
     data = {}
     ref_azimuth = ihdr[32 -1]
@@ -444,7 +689,7 @@ def _process_numeric_headers_v2(ihdr, rhdr, txthdr):
 FILE_TYPES = {
     "csmip.v1":  {"type": QuakeComponent,  "read": read_record_v2},
     "csmip.v2":  {"type": QuakeComponent,  "read": read_record_v2},
-    "csmip.v3":  {"type": QuakeComponent,  "read": read_record_v2, "spec": ""},
+    "csmip.v3":  {"type": QuakeComponent,  "read": read_record_v3},
     "csmip.zip": {"type": QuakeCollection, "read": read_event},
 }
 
@@ -1,27 +1,147 @@
 import re
+import warnings
+from pathlib import Path
 
 import numpy as np
 
-from quakeio.core import QuakeSeries
-from quakeio.utils.parseutils import open_quake
+from quakeio.core import QuakeSeries, QuakeComponent
+from quakeio.utils.parseutils import read_buffer
 
-RE_TIME_STEP = re.compile(r"DT=\s+(.*)SEC")
+# Line 4 of the NGA format, eg "NPTS=  4000, DT= .01000 SEC"
+RE_POINTS = re.compile(rb"NPTS=\s*([0-9]+)\s*,\s*DT=\s*([-+.0-9Ee]+)", re.IGNORECASE)
+# Line 4 of the older PEER format, eg "  4000    .0100    NPTS, DT"
+RE_POINTS_OLD = re.compile(rb"^\s*([0-9]+)\s+([-+.0-9Ee]+)\s+NPTS", re.IGNORECASE)
+# Line 3, eg "ACCELERATION TIME HISTORY IN UNITS OF G"
+RE_UNITS = re.compile(rb"IN UNITS OF\s+([A-Z0-9/*]+)", re.IGNORECASE)
+
+# File extensions of each series of an NGA record
+SERIES_EXTENSIONS = {"accel": ".at2", "veloc": ".vt2", "displ": ".dt2"}
+
+NUM_HEADER_LINES = 4
 
 
 def read_nga(read_file, *args, **kwds):
-    with open_quake(read_file, "r") as f:
-        match = RE_TIME_STEP.search(next(f))
-        header = [""]
-        while RE_TIME_STEP.search(header[-1]) is None:
-            header.append(next(f))
-
-        #header = [next(f) for _ in range(4)]
-    dt = float(RE_TIME_STEP.search(header[-1]).group(1).strip())
-    #dt = float(match.group(1).strip())
-    series_type = header[-2][:5].lower()
-    accel = np.genfromtxt(read_file, skip_header=4, skip_footer=1).flatten()
-    return QuakeSeries(
-        accel, dt, meta=dict(series_type=series_type, units="g")
+    """
+    Read a single PEER NGA file (`.AT2`, `.VT2` or `.DT2`) in one pass.
+    The file is read once, and the values following the four header
+    lines are decoded with a single numeric conversion.
+    """
+    return _read_nga(read_file)[0]
+
+
+def _read_nga(read_file):
+    series, dt, meta, header = _decode_nga(read_buffer(read_file), read_file)
+    return QuakeSeries(series, dt, meta=meta), header
+
+
+def _decode_nga(data: bytes, read_file=None):
+    """
+    Decode the contents of an NGA file and return the array of values,
+    the time step, the series metadata and the header lines.
+    """
+    header = data.split(b"\n", NUM_HEADER_LINES)
+    if len(header) <= NUM_HEADER_LINES:
+        raise ValueError(f"{read_file} is too short to be an NGA file")
+    body = header.pop()
+
+    match = RE_POINTS.search(header[3]) or RE_POINTS_OLD.search(header[3])
+    if match is None:
+        raise ValueError(f"Unable to find the number of points and time step in {read_file}")
+    npts, dt = int(match.group(1)), float(match.group(2))
+
+    # Decode all values in one pass, without splitting into tokens;
+    # decoding stops at the first field that is not a number
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        series = np.fromstring(body, sep=" ")[:npts]
+    if len(series) < npts:
+        raise ValueError(f"Expected {npts} values in {read_file}, found {len(series)}")
+
+    units = RE_UNITS.search(header[2])
+    meta = dict(
+        series_type = header[2][:5].decode("ascii", errors="replace").lower(),
+        units = units.group(1).decode("ascii").lower() if units else "g",
+        shape = npts
+    )
+    return series, dt, meta, header
+
+
+def group_files(files) -> dict:
+    """
+    Group NGA files that hold the acceleration, velocity and displacement
+    series of the same record (eg `IELC180.AT2`, `IELC180.VT2` and
+    `IELC180.DT2`). Returns a dict mapping the path of each record
+    without its extension to a dict mapping the series name
+    ("accel", "veloc", "displ") to the file.
+    """
+    series = {ext: typ for typ, ext in SERIES_EXTENSIONS.items()}
+    groups = {}
+    for file in map(Path, files):
+        typ = series.get(file.suffix.lower(), None)
+        if typ is not None:
+            groups.setdefault(file.with_suffix(""), {})[typ] = file
+    return groups
+
+
+def read_component(read_file, *args, **kwds) -> QuakeComponent:
+    """
+    Read the NGA record with the same name as `read_file` into a
+    `QuakeComponent`. Each of the `.AT2`, `.VT2` and `.DT2` files of the
+    record that exist next to `read_file` is read; series for which
+    there is no file are empty.
+    """
+    read_file = Path(read_file)
+    siblings = [
+        read_file.with_suffix(suffix) for ext in SERIES_EXTENSIONS.values()
+            for suffix in (ext.upper(), ext) if read_file.with_suffix(suffix).is_file()
+    ]
+    files = group_files([read_file, *siblings]).get(read_file.with_suffix(""), {})
+    if not files:
+        raise ValueError(f"{read_file} is not an NGA file")
+
+    series = {typ: _read_nga(file) for typ, file in files.items()}
+    header = next(iter(series.values()))[1][1].decode("ascii", errors="replace")
+
+    meta = {"file_name": read_file.with_suffix("").name, "record_identifier": header.strip()}
+    # eg, "IMPERIAL VALLEY 5/19/40 0439, EL CENTRO ARRAY #9, 180 (USGS STATION 117)"
+    fields = [field.strip() for field in header.split(",")]
+    if len(fields) == 3:
+        meta.update(event_name=fields[0], station_name=fields[1], component=fields[2].split()[0])
+
+    return QuakeComponent(
+        *(series[typ][0] if typ in series else QuakeSeries([]) for typ in SERIES_EXTENSIONS),
+        meta=meta
+    )
+
+
+def read_library(read_file, pattern: str = "*.[Aa][Tt]2", **kwds):
+    """
+    Read every NGA file in the directory `read_file` whose name matches
+    `pattern` (or each file of an iterable `read_file`) into a single
+    `quakeio.library.QuakeLibrary`. Records are named by the file name
+    without its extension.
+    """
+    from quakeio.library import QuakeLibrary
+
+    if isinstance(read_file, (str, Path)):
+        files = sorted(Path(read_file).glob(pattern))
+    else:
+        files = [Path(file) for file in read_file]
+
+    values, time_step, meta = [], [], []
+    for file in files:
+        series, dt, series_meta, _ = _decode_nga(read_buffer(file), file)
+        values.append(series)
+        time_step.append(dt)
+        meta.append(series_meta)
+
+    lengths = [len(v) for v in values]
+    return QuakeLibrary(
+        np.concatenate(values) if values else np.empty(0),
+        np.concatenate([[0], np.cumsum(lengths)]),
+        time_step,
+        names=[file.stem for file in files],
+        meta={k: [m[k] for m in meta] for k in ("series_type", "units")}
     )
 
 
@@ -29,5 +149,9 @@ FILE_TYPES = {
     "nga.at2": {
         "read": read_nga,
         "type": QuakeSeries,
-    }
+    },
+    "nga.component": {
+        "read": read_component,
+        "type": QuakeComponent,
+    },
 }
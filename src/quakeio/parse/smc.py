@@ -5,11 +5,12 @@ import sys
 import zipfile
 import warnings
 from pathlib import Path
+from functools import partial
 from collections import defaultdict
 
 import numpy as np
 
-from quakeio.utils.parseutils import open_quake
+from quakeio.utils.parseutils import open_quake, read_fixed_width, DeferredData
 
 from quakeio.core import (
      QuakeCollection,
@@ -23,59 +24,60 @@ from quakeio.core import (
 # it should be imported from a common utility module.
 _make_key = lambda strng: strng.strip().replace(" ", "_").lower()
 
-def _read_smc(read_file, archive = None, summarize=False):
+def _read_smc(read_file, archive = None, summarize=False, lazy=False):
     NUM_COLUMNS = 8
 
-    with open_quake(read_file, "r", archive) as f:
+    # Number of bytes that precede the data block
+    offset = 0
+    def take(f, count):
+        nonlocal offset
+        lines = [next(f) for _ in range(count)]
+        offset += sum(map(len, lines))
+        return lines
+
+    with open_quake(read_file, "r" if archive else "rb", archive) as f:
 
         # Text header; first 11 lines
-        txt_header = [next(f) for _ in range(11)]
+        txt_header = take(f, 11)
 
         # 48 integer values spanning 6 lines
-        int_header = np.genfromtxt(
-            f,
-            dtype=int,
-            max_rows=5,
-            ).flatten()
-        int_header = np.append(int_header , np.genfromtxt(
-            f,
-            dtype=int,
-            max_rows=1,
-            ).flatten()
-        )
+        int_header = np.array(b" ".join(take(f, 6)).split(), dtype=int)
         assert len(int_header) == 48
 
         # Value representing "undefined" or "null" in the integer header.
         int_null = int_header[0]
 
-        # real_header = [next(f) for _ in range(10)]
-
-        real_header = np.genfromtxt(
-          f,
-          max_rows= 10,
-#         delimiter=10,
-        ).flatten()
+        # 50 real values spanning 10 lines
+        real_header = np.array(b" ".join(take(f, 10)).split(), dtype=float)
 
         num_comment_lines = int_header[15]
         len_accel = int_header[16]
 
         # Parse comments
-        comments = [str(next(f)) for _ in range(num_comment_lines)]
+        comments = [str(line) for line in take(f, num_comment_lines)]
 
         # Parse data
-
-        if not summarize:
-            options = dict(
-                delimiter=10,
-                # skip_header=HEADER_END_LINE + 1,
-                #
+        loader = None
+        if summarize:
+            data = []
+        elif lazy:
+            # Defer reading data; record where the data block begins.
+            data = None
+            loader = DeferredData(
+                read_file if archive else Path(read_file).resolve(),
+                offset,
+                partial(_decode_data, count=len_accel),
+                archive=Path(archive.filename).resolve() if archive else None
             )
-            data = np.genfromtxt(f, max_rows=np.ceil(len_accel/NUM_COLUMNS) - 1, **options).flatten()
-            data = np.append(data, np.genfromtxt(f, max_rows=1, **options))
         else:
-            data = []
+            data = read_fixed_width(f, len_accel, 10, NUM_COLUMNS)
+
+    return txt_header, int_header, real_header, comments, data, loader
+
+
+def _decode_data(data: bytes, count: int):
+    return read_fixed_width(iter(data.splitlines(keepends=True)), count, 10, 8)
 
-    return txt_header, int_header, real_header, comments, data
 
 def read_series(
     read_file,
@@ -83,10 +85,12 @@ def read_series(
     verbosity: int  = 0,
     summarize: bool =False,
     exclusions: tuple = (),
+    lazy: bool = False,
     **kwds
 ) -> QuakeSeries:
 
-        txt_header, int_header, real_header, comments, data = _read_smc(read_file, archive, summarize=summarize)
+        txt_header, int_header, real_header, comments, data, loader = _read_smc(
+                read_file, archive, summarize=summarize, lazy=lazy)
 
         time_step = 1/float(real_header[1])
 
@@ -108,12 +112,18 @@ def read_series(
         return QuakeSeries(data, meta={"type": txt_header[0].decode(),
                                        "ihdr": int_header,
                                        "rhdr": real_header,
-                                       "time_step": time_step}), motion_data
+                                       "time_step": time_step},
+                           loader=loader), motion_data
 
 
 
-def read_event(read_file, verbosity=0, summarize=False, **kwds)->QuakeCollection:
+def read_event(read_file, verbosity=0, summarize=False, lazy=False, **kwds)->QuakeCollection:
     """
+    Read all of the .smc files in the zip archive `read_file`.
+
+    When `lazy` is True, only the headers of each file are parsed;
+    series data is decoded from the archive the first time it is
+    accessed, and can be released with `QuakeSeries.unload()`.
     """
 
     zippath    = Path(read_file)
@@ -133,7 +143,7 @@ def read_event(read_file, verbosity=0, summarize=False, **kwds)->QuakeCollection
             print(f"\t\t{file}", file=sys.stderr)
 
         series, motion_data = read_series(file, archive, verbosity=verbosity,
-                                          summarize=summarize, **kwds)
+                                          summarize=summarize, lazy=lazy, **kwds)
         
         if verbosity > 2:
             print(f"\t{motion_data['location_name']}")
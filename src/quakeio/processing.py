@@ -1,13 +1,9 @@
 
 from pathlib import Path
 import numpy as np
-from numpy import pi
 from quakeio.core import QuakeComponent, QuakeSeries
-
-try:
-    import jax.numpy as jnp
-except:
-    import numpy as jnp
+from quakeio.response import response_spectrum
+from quakeio.fourier import transfer_functions, konno_ohmachi
 
 
 
@@ -71,11 +67,15 @@ class Spectrum:
     def time(self):
         pass
 
-    def spect(self,accel=None,dt=None,damping=None,per=None,gamma=1/2,beta=1/4,interp=None):
-        if interp is None:
-            from scipy.interpolate import interp1d as interp
+    def spect(self,accel=None,dt=None,damping=None,per=None,gamma=1/2,beta=1/4,interp=None,backend=None,method=None,series=None):
         if damping is None:
             damping = ("damping" in self.kwds and self.kwds.pop("damping")) or 0.0
+        if backend is None:
+            backend = self.kwds.get("backend", "numpy")
+        if method is None:
+            method = self.kwds.get("method", "time")
+        if series is None:
+            series = self.kwds.get("series", "accel")
 
         if accel is None:
             accel = self._accel
@@ -103,7 +103,10 @@ class Spectrum:
             gamma=gamma,
             beta=beta,
             damping=damping,
-            interp=interp
+            interp=interp,
+            backend=backend,
+            method=method,
+            series=series
         )
 
 
@@ -134,73 +137,82 @@ class TransferFunction(Spectrum):
     @_plot_func
     def plot(self, **kwds):
         self.tf = tsa = transfer_function(self._pairs, **self.kwds)
-        if len(tsa) >= 2:
-            for sa in tsa[1:]:
-                self.ax.plot(tsa[0], sa)
-        self.ax.set_xlabel(f"Period, (sec.)")
-        chn1 = self._pairs[0]["channel"]
-        chn2 = self._pairs[1]["channel"]
+        if self.kwds.get("mode", "spectra") == "welch":
+            for amplitude in tsa["amplitude"]:
+                self.ax.plot(tsa["frequency"], amplitude)
+            self.ax.set_xlabel("Frequency, (Hz)")
+            pairs = self._pairs if isinstance(self._pairs[0], (tuple, list)) else [self._pairs]
+            chn1, chn2 = pairs[0][0]["channel"], pairs[0][1]["channel"]
+        else:
+            if len(tsa) >= 2:
+                for sa in tsa[1:]:
+                    self.ax.plot(tsa[0], sa)
+            self.ax.set_xlabel(f"Period, (sec.)")
+            chn1 = self._pairs[0]["channel"]
+            chn2 = self._pairs[1]["channel"]
         self.ax.set_title(f"Transfer function (Chn. {chn1} vs. {chn2})")
 
 
-def transfer_function(pairs, *args, **kwds):
+def transfer_function(pairs, *args, mode="spectra", **kwds):
+    """
+    With `mode="spectra"`, return the ratio of the response spectra of
+    the output `pairs[1]` to those of the input `pairs[0]`, with the
+    periods in the first row.
+
+    With `mode="welch"`, `pairs` is an (input, output) pair or a list
+    of such pairs, and the result is the dict of frequencies,
+    amplitude, phase and coherence returned by
+    `quakeio.fourier.transfer_functions`, to which `kwds` are passed.
+    """
+    if mode == "welch":
+        return _welch_transfer_function(pairs, **kwds)
     s1,s2 = Spectrum(pairs[0], **kwds).spect(), Spectrum(pairs[1], **kwds).spect()
     t = s2/s1
     t[0,:] = s1[0,:]
     return t
 
+def _welch_transfer_function(pairs, **kwds):
+    if not isinstance(pairs[0], (tuple, list)):
+        pairs = [pairs]
+    # Channels shared by several pairs are only transformed once
+    channels, index = [], {}
+    for pair in pairs:
+        for s in pair:
+            if id(s) not in index:
+                index[id(s)] = len(channels)
+                channels.append(s.accel if isinstance(s, QuakeComponent) else s)
+
+    dt = channels[0]["time_step"]
+    if any(not np.isclose(s["time_step"], dt) for s in channels):
+        raise ValueError("Expected all channels to have the same time step")
+    n = min(len(s.data) for s in channels)
+    return transfer_functions(
+        np.stack([s.data[:n] for s in channels]),
+        [(index[id(i)], index[id(o)]) for i, o in pairs],
+        dt, **kwds
+    )
+
 def spectrum(*args, **kwds):
     return _accel_spectrum(*args, **kwds)
 
-def _accel_spectrum(accel,dt,damping,per,gamma=1/2,beta=1/4,interp=None):
-    numper = len(per)
-    m = 1.0
-    numdata = len(accel)
-    t = np.arange(0,(numdata)*dt,dt)
-
-    u0,v0 = 0.0, 0.0
-    SA = np.zeros((1+len(damping), numper))
+def smooth(spectra, frequency, bandwidth=40.0, output=None):
+    """
+    Smooth the amplitude spectra `spectra` with the Konno-Ohmachi
+    window; see `quakeio.fourier.konno_ohmachi`.
+    """
+    return konno_ohmachi(spectra, frequency, bandwidth, output)
+
+def _accel_spectrum(accel,dt,damping,per,gamma=1/2,beta=1/4,interp=None,backend="numpy",method="time",series="accel"):
+    """
+    Return an array whose first row holds the periods `per` and whose
+    remaining rows hold the spectral acceleration (or, with `series`
+    "veloc" or "displ", the spectral velocity or displacement) for each
+    ratio in `damping`. `backend`, `method` and `series` are passed to
+    `quakeio.response.response_spectrum`;
+    `gamma`, `beta` and `interp` configured the former Newmark
+    integration and are ignored.
+    """
+    SA = np.zeros((1+len(damping), len(per)))
     SA[0,:] = per[:]
-
-    for di,dmp in enumerate(damping):
-
-        for i in range(numper):
-            if dt/per[i]>0.02:
-                dtp = per[i]*0.02
-                dtpx = np.arange(0,max(t),dtp)
-                dtpx = dtpx
-                accfrni = interp(t, accel)(dtpx)
-                accfrn = accfrni[1:len(accfrni)-1]
-                numdatan = len(accfrn)
-                p  =  -m*accfrn
-            else:
-                dtp = dt
-                accfrn = accel
-                p = -m*accfrn
-                numdatan = numdata
-
-            u = np.zeros((numdatan))
-            v = np.zeros((numdatan))
-            a = np.zeros((numdatan))
-
-            k = 4*pi**2*m/per[i]**2
-            c = 2*dmp*np.sqrt(k/m)
-            kstar = k + gamma*c/(beta*dtp) + m/(beta*dtp**2.0)
-            acons = m/(beta*dtp) + gamma*c/beta
-            bcons = m/(2*beta) + dtp*(gamma/(2*beta)-1)*c
-            u[0] = u0
-            v[0] = v0
-            a[0] = (p[0]-c*v[0]-k*u[0])/m
-            for j in range(1,numdatan):
-                deltap = p[j]-p[j-1]
-                deltaph = deltap+acons*v[j-1]+bcons*a[j-1]
-                deltau = deltaph/kstar
-                deltav = gamma*deltau/(beta*dtp) - gamma*v[j-1]/beta+dtp*(1-gamma/(2*beta))*a[j-1]
-                deltaa = deltau/(beta*dtp**2)-v[j-1]/(beta*dtp)-a[j-1]/(2*beta)
-                u[j] = u[j-1] + deltau
-                v[j] = v[j-1] + deltav
-                a[j] = a[j-1] + deltaa
-            atot = a + accfrn
-            SA[1+di,i] = abs(max(atot, key=abs))
+    SA[1:,:] = response_spectrum(accel, dt, per, damping, series=series, backend=backend, method=method)
     return SA
-
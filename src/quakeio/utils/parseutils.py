@@ -3,8 +3,12 @@ import io
 from os import PathLike
 from pathlib import Path
 from typing import Union, IO, Callable
+import fnmatch
+import zipfile
 import contextlib
 
+import numpy as np
+
 # Regular expression for extracting decimal number
 RE_DECIMAL = "[-]?[0-9]*[.]?[0-9]*"
 # Regular expression for extracting units
@@ -51,7 +55,240 @@ def open_quake(file, mode=None, archive=None):
             fh.close()
 
 
-def parse_sequential_fields(data, field_spec: dict, parsed_fields={}, verbose=False) -> dict:
+def read_buffer(file, archive=None) -> bytes:
+    """
+    Read the entire contents of `file` into memory. When `archive` is
+    given, `file` names a member of the `zipfile.ZipFile`, which is
+    then decompressed exactly once.
+    """
+    if archive is not None:
+        return archive.read(str(file))
+
+    with open_quake(file, "rb") as f:
+        data = f.read()
+
+    return data if isinstance(data, bytes) else data.encode("utf-8")
+
+
+def read_lines(file, count: int, archive=None) -> list:
+    """
+    Read only the first `count` lines of `file` (or of the member `file`
+    of `archive`) as bytes. Archive members are decompressed only as far
+    as is needed to produce these lines.
+    """
+    if archive is not None:
+        fh = archive.open(str(file), "r")
+    else:
+        fh = open(file, "rb")
+
+    with fh:
+        return [line for _, line in zip(range(count), fh)]
+
+
+class DeferredData:
+    """
+    Deferred loader for a block of data that begins at byte `offset`
+    of `file`, or of the member `file` of the zip archive at the path
+    `archive`. Calling the loader reads everything from `offset` onward
+    and returns `decode(data)`, where `data` is a `bytes` object.
+
+    Loaders only hold paths, so they can be pickled and sent to other
+    processes.
+    """
+    def __init__(self, file, offset: int, decode: Callable, archive=None):
+        self.file = str(file)
+        self.offset = offset
+        self.decode = decode
+        self.archive = str(archive) if archive is not None else None
+
+    def __call__(self):
+        if self.archive is not None:
+            with zipfile.ZipFile(self.archive) as archive:
+                with archive.open(self.file, "r") as f:
+                    # Seeking forward in an archive member still inflates
+                    # the skipped bytes, but they are not kept in memory.
+                    f.seek(self.offset)
+                    return self.decode(f.read())
+        else:
+            with open(self.file, "rb") as f:
+                f.seek(self.offset)
+                return self.decode(f.read())
+
+    def __repr__(self):
+        where = f"{self.archive}:{self.file}" if self.archive else self.file
+        return f"DeferredData({where}@{self.offset})"
+
+
+def read_fixed_width(lines, count: int, width: int, columns: int, dtype=float):
+    """
+    Decode `count` numeric fields of a Fortran-style fixed-width block
+    (eg `(8f10.6)`) by taking the next `ceil(count/columns)` rows from
+    the iterator `lines` and converting them to an array in a single
+    numeric conversion.
+
+    Rows may be `str` or `bytes`; a short final row is padded so that
+    every row spans exactly `columns*width` characters.
+    """
+    row_width = columns*width
+    num_rows  = -(-count // columns)
+
+    rows = []
+    for _ in range(num_rows):
+        row = next(lines)
+        if isinstance(row, str):
+            row = row.encode("ascii")
+        rows.append(row.rstrip(b"\r\n")[:row_width].ljust(row_width))
+
+    fields = np.frombuffer(b"".join(rows), dtype=f"S{width}", count=count)
+    try:
+        return fields.astype(dtype)
+    except ValueError:
+        # Blank fields; fall back to a field-by-field conversion in which
+        # blanks are treated as missing values.
+        return np.array(
+            [dtype(f) if f.strip() else np.nan for f in fields.tolist()]
+        )
+
+
+def _literal_anchor(pattern: str):
+    """
+    Return the longest word that must appear literally in every match
+    of the regular expression `pattern`, or None if no such word of at
+    least four letters is found. Only words outside of groups, classes
+    and escapes, which are not followed by a quantifier, are considered.
+    """
+    if "|" in pattern:
+        return None
+    words, word, depth, i = [], "", 0, 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c.isalpha() and depth == 0:
+            word += c
+        else:
+            if word and c not in "*?+{":
+                words.append(word)
+            word = ""
+            if c == "\\":
+                i += 1
+            elif c in "([":
+                depth += 1
+            elif c in ")]":
+                depth -= 1
+        i += 1
+    if word:
+        words.append(word)
+    words = [w for w in words if len(w) >= 4]
+    return max(words, key=len).encode("ascii") if words else None
+
+
+class HeaderParser:
+    """
+    Header parser compiled from a parse table with the layout accepted
+    by `parse_sequential_fields`, which it replaces for byte buffers.
+
+    Fields are extracted in table order. Fields pinned to a line number
+    are read directly from that line, and only the remaining (floating)
+    fields are searched for, line by line, starting at the line that
+    follows the previous field. Lines that do not contain a word which
+    the field's pattern requires are skipped without applying the
+    pattern. As with `parse_sequential_fields`, parsing stops at the
+    first floating field that cannot be found.
+
+    Exclusions are `fnmatch` patterns for keys that are dropped from
+    the table when it is compiled. The compiled parser is called with
+    the `bytes` contents of a file.
+    """
+    def __init__(self, field_spec: dict, exclusions: tuple = ()):
+        self.fields = []
+        for keys, (typs, pat) in field_spec.items():
+            if any(fnmatch.fnmatch(k, x) for x in exclusions for k in keys):
+                continue
+
+            if hasattr(pat, "pattern"):
+                line = None
+                anchor = _literal_anchor(pat.pattern)
+                # Case-insensitive patterns are anchored on lower-case text
+                if anchor and pat.flags & re.IGNORECASE:
+                    anchor = (anchor.lower(), True)
+                elif anchor:
+                    anchor = (anchor, False)
+            else:
+                line, pat = pat
+                line -= 1
+                anchor = None
+
+            if hasattr(pat, "pattern"):
+                pat = re.compile(pat.pattern.encode("ascii"), pat.flags & ~re.UNICODE)
+
+            self.fields.append((keys, typs, line, pat, anchor))
+
+    def __call__(self, data: bytes, verbose=False) -> dict:
+        parsed_fields = {}
+        lower = None
+        pos, ln = 0, 0
+        for fields, typs, lnum, pat, anchor in self.fields:
+            if lnum is None:
+                if anchor is not None and anchor[1] and lower is None:
+                    lower = data.lower()
+                match = self._search(data, pos, pat, anchor, lower)
+                if match is None:
+                    break
+                vals = match.groups(b"")
+                start = match.start()
+            else:
+                assert ln <= lnum
+                # Advance to the start of line `lnum`
+                start = pos
+                for _ in range(lnum - ln):
+                    start = data.find(b"\n", start) + 1 or len(data)
+                line = data[start:data.find(b"\n", start) + 1 or len(data)]
+                if isinstance(pat, tuple):
+                    vals = [line[s] for s in pat]
+                else:
+                    match = pat.search(line)
+                    vals = match.groups(b"") if match else ()
+
+            prefix = ""
+            for field, typ, val in zip(fields, typs, vals):
+                if field[0] == ".":
+                    key = prefix + field
+                else:
+                    prefix = field
+                    key = field
+                parsed_fields[key] = typ(val.decode("utf-8", errors="replace"))
+
+            # The next field is looked for beginning on the following line
+            ln += data.count(b"\n", pos, start) + 1
+            pos = data.find(b"\n", start) + 1 or len(data)
+
+        if verbose:
+            print(fields)
+
+        return parsed_fields
+
+    @staticmethod
+    def _search(data, pos, pat, anchor, lower=None):
+        if anchor is None:
+            return pat.search(data, pos)
+
+        anchor, fold = anchor
+        text = lower if fold else data
+        while True:
+            i = text.find(anchor, pos)
+            if i < 0:
+                return None
+            # Apply the pattern to the line that contains the anchor
+            start = text.rfind(b"\n", pos, i) + 1 or pos
+            end   = text.find(b"\n", i) + 1 or len(text)
+            match = pat.search(data, start, end)
+            if match is not None:
+                return match
+            pos = end
+
+
+def parse_sequential_fields(data, field_spec: dict, parsed_fields=None, verbose=False) -> dict:
+    if parsed_fields is None:
+        parsed_fields = {}
     field_iterator = iter(field_spec.items())
     fields, (typs, pat) = next(field_iterator)
     #print(f"\tfields: {fields}")
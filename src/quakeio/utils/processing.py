@@ -33,12 +33,12 @@ def get_time_series(series, time_series, time_step):
     if time_series:
         return time_series
     elif time_step:
-        return np.cumsum([time_step] * len(series))
+        return np.arange(1, len(series) + 1) * time_step
     else:
         if hasattr(series, "time_series"):
             return series.time_series
         elif hasattr(series, "time_step"):
-            return np.cumsum([series.time_step] * len(series))
+            return np.arange(1, len(series) + 1) * series.time_step
         else:
             msg = "Unable to deduce time series"
             raise TypeError(msg)
@@ -51,22 +51,25 @@ def rotate_series_in_place(series, sn=None, cs=None):
 def arias_intensity(
     series, start_level=0.0, end_level=1.0, time_series=None, time_step=None
 ):
+    """
+    Return pi/2 times the integral of `series` squared between the times
+    at which the normalized Husid curve reaches `start_level` and
+    `end_level`. When `series` is in units of g, this is the Arias
+    intensity in g-sec; see `quakeio.intensity` for the other measures.
+    """
     time = get_time_series(series, time_series, time_step)
     arias_factor = np.pi / 2.0
-    husid = integrate_husid(series, time)
+    husid = scipy.integrate.cumulative_trapezoid(np.asarray(series) ** 2.0, time, initial=0.0)
     # Normalize
     husid_norm = husid / husid[-1]
     idx = np.where(np.logical_and(husid_norm >= start_level, husid_norm <= end_level))[
         0
     ]
-    if len(idx) < len(series):
-        husid = integrate_husid(series[idx], time)
-
-    raise NotImplementedError("Not implemented")
-    return arias_factor * husid[-1]
+    if len(idx) == 0:
+        return 0.0
+    return arias_factor * (husid[idx[-1]] - husid[idx[0]])
 
 
 def integrate_husid(series, time_series=None, time_step=None):
     time = get_time_series(series, time_series, time_step)
-    return scipy.integrate.cumtrapz(series ** 2.0, time)
-
+    return scipy.integrate.cumulative_trapezoid(np.asarray(series) ** 2.0, time)
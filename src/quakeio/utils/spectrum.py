@@ -1,12 +1,7 @@
-try:
-    import jax.numpy as jnp
-except:
-    import numpy as jnp
-
 import numpy as np
-from numpy import pi
 import matplotlib.pyplot as plt
 from quakeio.core import QuakeComponent, QuakeSeries
+from quakeio.response import response_spectrum
 
 def _plot_func(plot):
     plt.style.use("berkeley")
@@ -37,11 +32,15 @@ class Spectrum:
     def time(self):
         pass
 
-    def spect(self,accel=None,dt=None,damping=None,per=None,gamma=1/2,beta=1/4,interp=None):
-        if interp is None:
-            from scipy.interpolate import interp1d as interp
+    def spect(self,accel=None,dt=None,damping=None,per=None,gamma=1/2,beta=1/4,interp=None,backend=None,method=None,series=None):
         if damping is None:
             damping = ("damping" in self.kwds and self.kwds.pop("damping")) or 0.0
+        if backend is None:
+            backend = self.kwds.get("backend", "numpy")
+        if method is None:
+            method = self.kwds.get("method", "time")
+        if series is None:
+            series = self.kwds.get("series", "accel")
         if isinstance(accel, QuakeComponent):
             dt = accel.accel["time_step"]
             accel = accel.accel.data
@@ -61,7 +60,10 @@ class Spectrum:
             gamma=gamma,
             beta=beta,
             damping=damping,
-            interp=interp
+            interp=interp,
+            backend=backend,
+            method=method,
+            series=series
         )
     
 
@@ -88,54 +90,17 @@ def transfer_function(pairs, *args, **kwds):
 def spectrum(*args, **kwds):
     return _accel_spectrum(*args, **kwds)
 
-def _accel_spectrum(accel,dt,damping,per,gamma=1/2,beta=1/4,interp=None):
-    numper=len(per)
-    m = 1.0
-    numdata=len(accel)
-    t=np.arange(0,(numdata)*dt,dt)
-    
-    u0,v0 = 0.0, 0.0
-    SA = np.zeros((1+len(damping),numper))
+def _accel_spectrum(accel,dt,damping,per,gamma=1/2,beta=1/4,interp=None,backend="numpy",method="time",series="accel"):
+    """
+    Return an array whose first row holds the periods `per` and whose
+    remaining rows hold the spectral acceleration (or, with `series`
+    "veloc" or "displ", the spectral velocity or displacement) for each
+    ratio in `damping`. `backend`, `method` and `series` are passed to
+    `quakeio.response.response_spectrum`;
+    `gamma`, `beta` and `interp` configured the former Newmark
+    integration and are ignored.
+    """
+    SA = np.zeros((1+len(damping), len(per)))
     SA[0,:] = per[:]
-
-    for di,dmp in enumerate(damping):
-        for i in range(numper):
-            if dt/per[i]>0.02:
-                dtp = per[i]*0.02
-                dtpx = np.arange(0,max(t),dtp)
-                dtpx = dtpx
-                accfrni = interp(t, accel)(dtpx)
-                accfrn = accfrni[1:len(accfrni)-1]
-                numdatan = len(accfrn)
-                p = -m*accfrn
-            else:
-                dtp=dt;
-                accfrn = accel;
-                p = -m*accfrn;
-                numdatan=numdata;
-
-            u = np.zeros((numdatan))
-            v = np.zeros((numdatan))
-            a = np.zeros((numdatan))
-
-            k = 4*pi**2*m/per[i]**2;
-            c = 2*dmp*np.sqrt(k/m);
-            kstar = k + gamma*c/(beta*dtp) + m/(beta*dtp**2.0)
-            acons = m/(beta*dtp) + gamma*c/beta
-            bcons = m/(2*beta) + dtp*(gamma/(2*beta)-1)*c
-            u[0] = u0
-            v[0] = v0
-            a[0] = (p[0]-c*v[0]-k*u[0])/m
-            for j in range(1,numdatan):
-                deltap = p[j]-p[j-1]
-                deltaph = deltap+acons*v[j-1]+bcons*a[j-1]
-                deltau = deltaph/kstar
-                deltav = gamma*deltau/(beta*dtp)-gamma*v[j-1]/beta+dtp*(1-gamma/(2*beta))*a[j-1]
-                deltaa = deltau/(beta*dtp**2)-v[j-1]/(beta*dtp)-a[j-1]/(2*beta)
-                u[j] = u[j-1] + deltau
-                v[j] = v[j-1] + deltav
-                a[j] = a[j-1] + deltaa
-            atot = a + accfrn
-            SA[1+di,i] = abs(max(atot, key = abs));
+    SA[1:,:] = response_spectrum(accel, dt, per, damping, series=series, backend=backend, method=method)
     return SA
-
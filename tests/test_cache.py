@@ -0,0 +1,72 @@
+import numpy as np
+
+import quakeio
+from quakeio.cache import QuakeCache
+from quakeio.__main__ import main
+
+csmip_archive = "dat/58658_007_20210426_10.09.54.P.zip"
+csmip_record  = "dat/58658_007_20210426_10.09.54.P/chan001.v2"
+
+
+def test_read_cached(tmp_path):
+    parsed = quakeio.read(csmip_archive, cache_dir=tmp_path)
+    cached = quakeio.read(csmip_archive, cache_dir=tmp_path)
+    assert len(QuakeCache(tmp_path).entries()) == 1
+
+    assert dict(cached) == dict(parsed)
+    assert list(cached.motions) == list(parsed.motions)
+    for key, motion in parsed.motions.items():
+        assert list(cached.motions[key].components) == list(motion.components)
+        for drn, component in motion.components.items():
+            other = cached.motions[key].components[drn]
+            assert dict(other) == dict(component)
+            for s in "accel", "veloc", "displ":
+                assert dict(getattr(other, s)) == dict(getattr(component, s))
+                assert np.array_equal(getattr(other, s).data, getattr(component, s).data)
+
+    # Cached data is memory-mapped copy-on-write
+    series = next(cached.components).accel
+    assert isinstance(series.data.base, np.memmap)
+    series.data[:] = 0.0
+    assert not np.all(next(quakeio.read(csmip_archive, cache_dir=tmp_path).components).accel.data == 0.0)
+
+
+def test_read_cached_lazy(tmp_path):
+    # A lazy read does not load the data to populate the cache
+    lazy = quakeio.read(csmip_archive, cache_dir=tmp_path, lazy=True)
+    assert not any(c.accel.loaded for c in lazy.components)
+    assert len(QuakeCache(tmp_path).entries()) == 0
+
+    # but is served from an entry stored by another read
+    quakeio.read(csmip_archive, cache_dir=tmp_path)
+    cached = quakeio.read(csmip_archive, cache_dir=tmp_path, lazy=True)
+    assert len(QuakeCache(tmp_path).entries()) == 1
+    assert isinstance(next(cached.components).accel.data.base, np.memmap)
+
+
+def test_cache_key(tmp_path):
+    cache = QuakeCache(tmp_path)
+    key = cache.key(csmip_record, "csmip.v2", {})
+    assert key == cache.key(csmip_record, "csmip.v2", {"verbosity": 2})
+    assert key != cache.key(csmip_record, "csmip.v2", {"summarize": True})
+    assert key != cache.key(csmip_record, "csmip.v2", {}, content_hash=True)
+
+
+def test_cache_evict(tmp_path):
+    quakeio.read(csmip_record, cache_dir=tmp_path)
+    quakeio.read(csmip_archive, cache_dir=tmp_path)
+    cache = QuakeCache(tmp_path)
+    (first, size, _), (last, _, _) = cache.entries()
+
+    # Reading the first file again makes it the most recently used
+    quakeio.read(csmip_record, cache_dir=tmp_path)
+    assert cache.evict(size) == [last]
+    assert [key for key, *_ in cache.entries()] == [first]
+
+
+def test_cache_cli(tmp_path, capsys):
+    quakeio.read(csmip_record, cache_dir=tmp_path)
+    main(["cache", "list", "--dir", str(tmp_path)])
+    assert "1 entries" in capsys.readouterr().out
+    main(["cache", "purge", "--dir", str(tmp_path)])
+    assert QuakeCache(tmp_path).entries() == []
@@ -0,0 +1,43 @@
+import numpy as np
+
+import quakeio
+from quakeio.core import QuakeSeries
+from quakeio.parse.chunked import write_chunked, read_chunked
+
+
+def test_round_trip(tmp_path):
+    from .test_csmip import test_read_event
+    event = test_read_event()
+    quakeio.write(tmp_path/"event.qkc", event, chunk_size=1000)
+    event_2 = quakeio.read(tmp_path/"event.qkc", format="quake.chunked")
+    assert dict(event_2) == dict(event)
+    assert list(event_2.motions) == list(event.motions)
+    for component, other in zip(event.components, event_2.components):
+        assert dict(other) == dict(component)
+        for s in "accel", "veloc", "displ":
+            assert not getattr(other, s).loaded
+            assert dict(getattr(other, s)) == dict(getattr(component, s))
+            assert np.array_equal(getattr(other, s).data, getattr(component, s).data)
+
+def test_chunked_array(tmp_path):
+    data = np.arange(1000, dtype=float)
+    write_chunked(tmp_path/"series.qkc", QuakeSeries(data, meta={"time_step": 0.01}), chunk_size=64)
+    array = read_chunked(tmp_path/"series.qkc")._loader
+    for index in slice(None), slice(10, 20), slice(60, 70), slice(63, 640, 3), slice(-5, None), slice(5, 2):
+        assert np.array_equal(array[index], data[index])
+    assert array[-1] == data[-1] and array[64] == data[64]
+
+def test_window(tmp_path):
+    data = np.sin(np.arange(10000)/100)
+    write_chunked(tmp_path/"series.qkc", QuakeSeries(data, meta={"time_step": 0.01}), chunk_size=500)
+    series = read_chunked(tmp_path/"series.qkc")
+
+    window = series.window(12.0, 20.0)
+    assert not series.loaded
+    assert window.time_zero == 12.0
+    assert np.array_equal(window.data, data[1200:2001])
+    assert window["peak_value"] == max(data[1200:2001], key=abs)
+
+    assert np.array_equal(series.window(end=1.0).data, data[:101])
+    assert np.array_equal(series.window(95.0).data, data[9500:])
+    assert np.array_equal(series.window(12.0, 20.0).data, QuakeSeries(data, meta={"time_step": 0.01}).window(12.0, 20.0).data)
@@ -1,3 +1,5 @@
+from copy import copy
+
 import numpy as np
 
 import quakeio
@@ -77,3 +79,200 @@ def test_rotate_displ():
     assert np.isclose(float(D_long_rot.data[time]), float(a_calc_long))
     assert np.isclose(float(D_tran_rot.data[time]), float(a_calc_tran))
 
+
+
+def test_pack():
+    angle = 21/7/3
+    from .test_csmip import test_read_event
+    event = test_read_event()
+    top = event.motions["bent_4_north_column_top"]
+    bot = event.motions["bent_4_north_column_grnd_level"]
+    diff = (top - bot).resultant().displ.data
+
+    top.pack()
+    bot.pack()
+    # Component series are views of the packed array
+    assert top.accel is top.accel
+    assert np.shares_memory(top.long.accel.data, top.accel)
+    assert np.allclose((top - bot).resultant().displ.data, diff)
+
+    expected = bot.displ @ np.array([
+        [ np.cos(angle), np.sin(angle)],
+        [-np.sin(angle), np.cos(angle)]
+    ])
+    bot.rotate(angle)
+    assert np.allclose(bot.displ, expected)
+    assert np.shares_memory(bot.long.displ.data, bot.displ)
+
+    # Replacing a series drops the packed array
+    bot.long.accel = quakeio.core.QuakeSeries(bot.long.accel.data.copy(), meta=bot.long.accel)
+    assert not np.shares_memory(bot.long.accel.data, bot.accel)
+
+
+def test_series_statistics():
+    data = np.array([0.5, -2.0, 1.0, 2.0, -0.25])
+    series = quakeio.core.QuakeSeries(data.copy(), dt=0.1, time_zero=1.0)
+    assert series["peak_value"] == series.peak_value == -2.0
+    assert np.isclose(series.peak_time, 1.1)
+    assert np.isclose(series.rms, np.sqrt(np.mean(data**2)))
+    assert (series.min_value, series.max_value) == (-2.0, 2.0)
+
+    # Statistics follow changes to the data
+    scaled = series*-3.0
+    assert scaled.peak_value == 6.0 and scaled["peak_value"] == 6.0
+    series._data = data[2:]
+    assert series.peak_value == 2.0
+    assert np.isclose(series.peak_time, 1.1)
+
+    assert quakeio.core.QuakeSeries([]).peak_value is None
+
+
+def test_rotate_statistics():
+    from .test_csmip import test_read_event
+    mot = test_read_event().motions["bent_4_north_column_grnd_level"]
+    mot.rotate(0.7)
+    for dirn in ("long", "tran"):
+        accel = mot.components[dirn].accel
+        assert accel.peak_value == max(accel.data, key=abs)
+        assert accel["peak_value"] == accel.peak_value
+
+
+def test_series_operators():
+    Series = quakeio.core.QuakeSeries
+    a = Series(np.array([1.0, -4.0, 2.0]), dt=0.1)
+    b = Series(np.array([0.5, 1.0, 3.0]), dt=0.1)
+    a_data = a.data
+
+    # Binary operators leave their operands unchanged
+    assert np.array_equal((a - b).data, [0.5, -5.0, -1.0])
+    assert np.array_equal((1.0 - a).data, [0.0, 5.0, -1.0])
+    assert np.array_equal((a + b).data, [1.5, -3.0, 5.0])
+    assert np.array_equal((a*2).data, [2.0, -8.0, 4.0])
+    assert np.array_equal(a.data, [1.0, -4.0, 2.0])
+    assert (a - b)["peak_value"] == -5.0
+
+    # In-place operators reuse the buffer
+    a += b
+    a *= 2
+    assert a.data is a_data
+    assert np.array_equal(a.data, [3.0, -6.0, 10.0])
+    assert a["peak_value"] == a.peak_value == 10.0
+
+    # ufuncs write to series passed as out=
+    out = Series(np.empty(3), dt=0.1)
+    ret = np.subtract(a, b, out=out)
+    assert ret is out
+    assert np.array_equal(out.data, [2.5, -7.0, 7.0])
+    assert out.peak_value == -7.0
+    assert isinstance(np.abs(a), Series)
+    assert np.add.reduce(b) == 4.5
+
+
+def test_component_operators():
+    from .test_csmip import test_read_event
+    event = test_read_event()
+    top = event.motions["bent_4_north_column_top"].components["long"]
+    bot = event.motions["bent_4_north_column_grnd_level"].components["long"]
+    top_displ, bot_displ = top.displ.data.copy(), bot.displ.data.copy()
+
+    diff = top - bot
+    assert np.allclose(diff.displ.data, top_displ - bot_displ)
+    assert np.array_equal(top.displ.data, top_displ)
+    assert np.array_equal(bot.displ.data, bot_displ)
+
+    data = top.displ.data
+    top -= bot
+    assert top.displ.data is data
+    assert np.allclose(top.displ.data, diff.displ.data)
+
+
+def test_time_axis():
+    time = quakeio.core.TimeAxis(1.0, 0.01, 501)
+    times = 1.0 + np.arange(501)*0.01
+    assert len(time) == 501 and time[0] == 1.0 and np.isclose(time[-1], 6.0)
+    assert isinstance(time[10:20:2], quakeio.core.TimeAxis)
+    assert np.allclose(time[10:20:2], times[10:20:2])
+    assert np.allclose(time + 1.0, times + 1.0)
+
+    t = np.concatenate([times[::7], times[::7] + 0.003, [-1.0, 10.0]])
+    for side in ("left", "right"):
+        assert np.array_equal(time.searchsorted(t, side), np.searchsorted(times, t, side))
+    assert time.searchsorted(times[3]) == 3
+
+    # Series with the same sampling share one axis and array of times
+    a = quakeio.core.QuakeSeries(np.zeros(501), dt=0.01, time_zero=1.0)
+    b = quakeio.core.QuakeSeries(np.ones(501), dt=0.01, time_zero=1.0)
+    assert a.time is b.time
+    assert np.asarray(a.time) is np.asarray(b.time)
+
+    a.slice(2.0, 3.0)
+    assert np.isclose(a.time_zero, 2.01) and len(a.data) == 99
+
+
+def test_component_operators_copy():
+    Series, Component = quakeio.core.QuakeSeries, quakeio.core.QuakeComponent
+    a = Component(Series(np.array([1.0, 2.0])), Series(np.array([1.0, 2.0])), None)
+    b = Component(Series(np.array([3.0, 4.0])), Series([]), Series(np.array([5.0, 6.0])))
+
+    diff = a - b
+    assert np.array_equal(diff.accel.data, [-2.0, -2.0])
+    # Series that are missing, or of different lengths, are dropped
+    assert diff.veloc is None and diff.displ is None
+
+    diff.accel *= 10.0
+    assert np.array_equal(a.accel.data, [1.0, 2.0])
+    assert np.array_equal(b.accel.data, [3.0, 4.0])
+
+
+def test_time_axis_cache(monkeypatch):
+    monkeypatch.setattr(quakeio.core, "_time_arrays", type(quakeio.core._time_arrays)())
+    monkeypatch.setattr(quakeio.core, "TIME_AXIS_CACHE_BYTES", 3*8*1000)
+    for t0 in range(5):
+        np.asarray(quakeio.core.TimeAxis(t0, 0.01, 1000))
+    assert sum(a.nbytes for a in quakeio.core._time_arrays.values()) <= 3*8*1000
+    assert [k[0] for k in quakeio.core._time_arrays] == [2.0, 3.0, 4.0]
+    # Arrays larger than the cache are not kept
+    np.asarray(quakeio.core.TimeAxis(0.0, 0.01, 5000))
+    assert len(quakeio.core._time_arrays) == 3
+
+    # The time axis of deferred data does not load it
+    event = quakeio.read("dat/58658_007_20210426_10.09.54.P.zip", lazy=True)
+    accel = next(event.components).accel
+    assert len(accel.time) == accel["shape"]
+    assert not accel.loaded
+
+
+def test_series_statistics_modified():
+    series = quakeio.core.QuakeSeries(np.array([1.0, -2.0, 0.5]), dt=0.1)
+    assert series.peak_value == -2.0
+
+    series.data = np.array([3.0, 1.0])
+    assert series.peak_value == series["peak_value"] == 3.0
+
+    # Writes into the array directly are recorded with `modified`
+    np.multiply(series.data, -2, out=series.data)
+    series.modified()
+    assert series.peak_value == series["peak_value"] == -6.0
+    assert series.min_value == -6.0 and series.max_value == -2.0
+
+
+def test_pack_copy():
+    from .test_csmip import test_read_event
+    event = test_read_event()
+    top = event.motions["bent_4_north_column_top"].pack()
+    bot = event.motions["bent_4_north_column_grnd_level"]
+
+    # The unpacked difference does not unpack its operand
+    diff = top - bot
+    assert diff._buffers is not top._buffers
+    diff.accel
+    assert np.shares_memory(top.long.accel.data, top.accel)
+
+    bot.pack()
+    assert list((top - bot).components) == list(top.components)
+
+    # Packed and unpacked operations give the same components
+    reordered = copy(bot)
+    reordered.components = {k: bot.components[k] for k in reversed(list(bot.components))}
+    reordered.pack()
+    assert list((top - reordered).components) == list((top - bot).components)
@@ -12,6 +12,66 @@ csmip_dir = Path("dat/58658_007_20210426_10.09.54.P/")
 def test_read_event():
     return quakeio.csmip.read_event(csmip_archive)
 
+def test_read_event_single_pass(capsys):
+    import zipfile
+    quakeio.csmip.read_event(csmip_archive, verbosity=2)
+    with zipfile.ZipFile(csmip_archive) as archive:
+        nbytes = sum(i.file_size for i in archive.infolist() if i.filename.endswith(".v2"))
+    assert f"decompressed {nbytes} bytes" in capsys.readouterr().err
+
+def test_read_event_workers():
+    import numpy as np
+    from concurrent.futures import ThreadPoolExecutor
+    serial = quakeio.csmip.read_event(csmip_archive)
+    for options in dict(workers=2), dict(executor=ThreadPoolExecutor(2)):
+        parallel = quakeio.csmip.read_event(csmip_archive, **options)
+        assert dict(parallel) == dict(serial)
+        assert list(parallel.motions) == list(serial.motions)
+        for key, motion in serial.motions.items():
+            assert list(parallel.motions[key].components) == list(motion.components)
+            for drn, component in motion.components.items():
+                assert dict(parallel.motions[key].components[drn]) == dict(component)
+                assert np.array_equal(parallel.motions[key].components[drn].accel.data,
+                                      component.accel.data)
+
+def test_read_event_lazy():
+    import numpy as np
+    eager = test_read_event()
+    lazy  = quakeio.read(csmip_archive, lazy=True)
+    assert dict(lazy) == dict(eager)
+    for c_lazy, c_eager in zip(lazy.components, eager.components):
+        for s in "accel", "veloc", "displ":
+            series = getattr(c_lazy, s)
+            assert not series.loaded
+            assert dict(series) == dict(getattr(c_eager, s))
+            assert np.array_equal(series.data, getattr(c_eager, s).data)
+            series.unload()
+            assert not series.loaded
+
+def test_read_event_lazy_v1(tmp_path):
+    import zipfile
+    # A V1 archive built from the V2 records; V1 files give no peaks
+    archive = tmp_path/"event.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        for file in sorted(csmip_dir.glob("*.v2"))[:3]:
+            lines = file.read_bytes().splitlines(keepends=True)
+            z.writestr(file.with_suffix(".v1").name, b"".join(lines[:13] + lines[25:39] + lines[45:]))
+
+    eager = quakeio.csmip.read_event(archive)
+    lazy  = quakeio.csmip.read_event(archive, lazy=True)
+    assert "peak_accel" not in lazy
+    assert eager["peak_accel"] != 0.0
+    for c_lazy, c_eager in zip(lazy.components, eager.components):
+        assert not c_lazy.accel.loaded
+        assert c_lazy.accel["peak_value"] == c_eager.accel["peak_value"]
+        assert c_lazy.accel.loaded
+
+def test_read_event_spectra():
+    event = quakeio.read("dat/tomsplace_26nov2006_ce54730p.zip", spectra=True)
+    for component in event.components:
+        assert component.spectra["sa"].shape == (91, 5)
+        assert list(component.spectra["damping"]) == [0.0, 0.02, 0.05, 0.1, 0.2]
+
 def test_unique():
     event = test_read_event()
     all_components = [c for m in event.motions.values() for c in m.components]
@@ -55,6 +115,47 @@ def test_veloc_data():
     assert csmip_record.veloc.data[0]  == 0.0000950
     assert csmip_record.veloc.data[-1] == 0.0001009
 
+def test_read_v3():
+    csmip_record = quakeio.read(csmip_dir / "chan001.v3")
+    spectra = csmip_record.spectra
+    assert csmip_record["location_name"] == "Abutment 1"
+    assert spectra["period"].shape == (78,)
+    assert spectra["period"][0] == 0.04 and spectra["period"][-1] == 6.0
+    assert list(spectra["damping"]) == [0.05]
+    assert spectra["sa"].shape == (78, 1)
+    assert spectra["sd"][0, 0] == 0.495e-3
+
+def test_header_parser():
+    from quakeio.parse.csmip import HEADER_FIELDS, _header_parser
+    from quakeio.utils.parseutils import parse_sequential_fields
+    assert _header_parser("v2", ()) is _header_parser("v2", ())
+
+    data = (csmip_dir/"chan001.v2").read_bytes()
+    header = _header_parser("v2", ())(data)
+    lines  = (line.decode() for line in data.splitlines(keepends=True))
+    assert header == parse_sequential_fields(lines, HEADER_FIELDS)
+    assert header["displ.shape"] == 13000
+    assert header["record.station.no"] == "58658"
+
+def test_data_format():
+    from quakeio.parse.csmip import _parse_data_format
+    line = " 13000 points of accel data equally spaced at 0.005 sec, in cm/sec2. (8f10.6)"
+    assert _parse_data_format(line) == (13000, 8, 10)
+    line = b" 1138 POINTS OF ACCEL DATA EQUALLY SPACED AT  .020 SEC.  (UNITS: CM/SEC/SEC)"
+    assert _parse_data_format(line, 9) == (1138, 8, 9)
+
+def test_fixed_width():
+    import numpy as np
+    from quakeio.utils.parseutils import read_fixed_width
+    with open(csmip_dir/"chan001.v2", "r") as f:
+        lines = f.readlines()[46:46+1625]
+    expect = np.genfromtxt(lines, delimiter=10).flatten()
+    accel  = read_fixed_width(iter(lines), 13000, 10, 8)
+    assert np.array_equal(accel, expect)
+    # rows may be bytes and the final row may be short
+    accel  = read_fixed_width((l.encode() for l in lines), 12997, 10, 8)
+    assert np.array_equal(accel, expect[:12997])
+
 
 # csmip_record = quakeio.QuakeComponent(csmip_dir/"chan001.v2")
 if __name__ == "__main__":
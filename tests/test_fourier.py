@@ -0,0 +1,67 @@
+import numpy as np
+import scipy.signal
+
+import quakeio
+from quakeio.fourier import transfer_functions, konno_ohmachi, konno_ohmachi_matrix, smoothing_cache_info
+
+csmip_archive = "dat/58658_007_20210426_10.09.54.P.zip"
+
+
+def test_transfer_functions():
+    event = quakeio.read(csmip_archive)
+    channels = np.stack([c.accel.data for c in list(event.components)[:4]])
+    pairs = [(0, 1), (0, 2), (3, 1)]
+    result = transfer_functions(channels, pairs, 0.005, nperseg=512)
+    assert result["amplitude"].shape == result["coherence"].shape == (len(pairs), 257)
+
+    for k, (i, j) in enumerate(pairs):
+        f, Pxy = scipy.signal.csd(channels[i], channels[j], fs=200, nperseg=512)
+        _, Pxx = scipy.signal.welch(channels[i], fs=200, nperseg=512)
+        _, C = scipy.signal.coherence(channels[i], channels[j], fs=200, nperseg=512)
+        assert np.allclose(result["frequency"], f)
+        assert np.allclose(result["amplitude"][k], np.abs(Pxy/Pxx))
+        assert np.allclose(result["phase"][k], np.angle(Pxy/Pxx))
+        assert np.allclose(result["coherence"][k], C)
+
+
+def test_transfer_function_identity():
+    rng = np.random.default_rng(1)
+    x = rng.standard_normal(4096)
+    result = transfer_functions([x, 2*x], [(0, 1)], 0.01)
+    assert np.allclose(result["amplitude"][0, 1:], 2.0)
+    assert np.allclose(result["phase"][0, 1:], 0.0)
+    assert np.allclose(result["coherence"][0, 1:], 1.0)
+
+
+def test_konno_ohmachi():
+    frequency = np.fft.rfftfreq(1024, 0.01)
+    spectra = np.abs(np.fft.rfft(np.random.default_rng(2).standard_normal((3, 1024)), axis=-1))
+
+    # Direct evaluation of the full window at each frequency
+    expected = np.empty_like(spectra)
+    expected[:, 0] = spectra[:, 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i, fc in enumerate(frequency[1:], 1):
+            x = 40*np.log10(frequency/fc)
+            w = np.nan_to_num((np.sin(x)/x)**4, nan=0.0)
+            w[i] = 1.0
+            expected[:, i] = spectra @ w/w.sum()
+
+    assert konno_ohmachi_matrix(frequency).nnz < len(frequency)**2
+    assert np.allclose(konno_ohmachi(spectra, frequency), expected, rtol=2e-3)
+
+    hits = smoothing_cache_info().hits
+    output = np.geomspace(frequency[1], frequency[-1], 50)
+    smoothed = konno_ohmachi(spectra, frequency, output=output)
+    konno_ohmachi(spectra, frequency, output=output)
+    assert smoothed.shape == (3, 50)
+    assert smoothing_cache_info().hits == hits + 1
+    assert np.allclose(konno_ohmachi(np.ones(len(frequency)), frequency, output=output), 1.0)
+
+
+def test_transfer_function_smoothing():
+    event = quakeio.read(csmip_archive)
+    channels = np.stack([c.accel.data for c in list(event.components)[:2]])
+    raw = transfer_functions(channels, [(0, 1)], 0.005, nperseg=512)
+    smoothed = transfer_functions(channels, [(0, 1)], 0.005, nperseg=512, smoothing=40.0)
+    assert np.allclose(smoothed["amplitude"], konno_ohmachi(raw["amplitude"], raw["frequency"]))
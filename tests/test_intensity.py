@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+import scipy.integrate
+
+import quakeio
+from quakeio.intensity import intensity_measures, gravity
+from quakeio.utils.processing import arias_intensity
+
+csmip_archive = "dat/58658_007_20210426_10.09.54.P.zip"
+
+
+def test_intensity_measures():
+    series = quakeio.read("dat/nga/IELC180.AT2")
+    accel, dt = series.data, series["time_step"]
+    measures = intensity_measures(accel, dt)
+
+    husid = scipy.integrate.cumulative_trapezoid(accel**2, dx=dt, initial=0.0)
+    assert np.isclose(measures["arias_intensity"], np.pi/2*husid[-1])
+    assert np.isclose(measures["arias_intensity"], arias_intensity(accel, time_step=dt))
+    assert np.allclose(measures["husid"], husid/husid[-1])
+    assert np.isclose(measures["cav"], scipy.integrate.trapezoid(np.abs(accel), dx=dt))
+
+    t = np.arange(len(accel))*dt
+    for key, (start, end) in {"d5_75": (0.05, 0.75), "d5_95": (0.05, 0.95)}.items():
+        expected = np.interp(end, husid/husid[-1], t) - np.interp(start, husid/husid[-1], t)
+        assert np.isclose(measures[key], expected, atol=dt)
+
+    exceeds = np.flatnonzero(np.abs(accel) >= 0.05)
+    assert np.isclose(measures["bracketed_duration"], (exceeds[-1] - exceeds[0])*dt)
+    assert measures["pga"] == np.max(np.abs(accel))
+    assert measures["pga_time"] == np.argmax(np.abs(accel))*dt
+
+
+def test_intensity_measures_batch():
+    event = quakeio.read(csmip_archive)
+    batch = event.intensity_measures()
+    assert list(batch) == list(event.motions)
+    for loc, motion in event.motions.items():
+        for drn, component in motion.components.items():
+            single = component.intensity_measures()
+            assert set(batch[loc][drn]) == set(single)
+            for key, value in single.items():
+                assert np.allclose(batch[loc][drn][key], value)
+
+    component = next(event.components)
+    assert gravity(component.accel["units"]) == 980.665
+    assert component.intensity_measures()["pgv"] == np.max(np.abs(component.veloc.data))
+
+
+def test_intensity_measures_unknown_units():
+    series = quakeio.read("dat/nga/IELC180.AT2")
+    component = quakeio.core.QuakeComponent(series, None, None)
+    expected = component.intensity_measures()
+
+    series["units"] = "furlong/fortnight/fortnight"
+    with pytest.warns(UserWarning, match="Unknown acceleration units"):
+        measures = component.intensity_measures()
+    assert np.isnan(measures["arias_intensity"])
+    assert np.isnan(measures["bracketed_duration"])
+    for key in "d5_75", "d5_95", "cav", "pga":
+        assert measures[key] == expected[key]
@@ -0,0 +1,62 @@
+import pickle
+
+import numpy as np
+
+import quakeio
+from quakeio.core import QuakeSeries
+from quakeio.library import QuakeLibrary
+from quakeio.parse.nga import read_library
+
+
+def _library():
+    rng = np.random.default_rng(1)
+    series = [
+        QuakeSeries(rng.standard_normal(n), dt, meta={"units": "g"})
+            for n, dt in ((100, 0.01), (0, 0.02), (257, 0.005))
+    ]
+    return series, QuakeLibrary.from_series(series, names=["a", "b", "c"])
+
+def test_views():
+    series, library = _library()
+    assert len(library) == 3
+    assert list(library.offsets) == [0, 100, 100, 357]
+    for s, name in zip(series, ("a", "b", "c")):
+        view = library[name]
+        assert np.shares_memory(view.data, library.data) or len(view.data) == 0
+        assert np.array_equal(view.data, s.data)
+        assert view["time_step"] == s["time_step"] and view["units"] == "g"
+        if len(s.data):
+            assert view["peak_value"] == max(s.data, key=abs)
+
+def test_save_load(tmp_path):
+    _, library = _library()
+    library.save(tmp_path/"library.npz")
+    for mmap_mode in None, "r":
+        other = QuakeLibrary.load(tmp_path/"library.npz", mmap_mode=mmap_mode)
+        assert other.names == library.names and other.meta == library.meta
+        assert np.array_equal(other.data, library.data)
+        assert np.array_equal(other.peak_value, library.peak_value)
+    assert isinstance(other.data.base, np.memmap)
+
+    other = pickle.loads(pickle.dumps(library))
+    assert np.array_equal(other.record("c"), library.record("c"))
+
+def test_read_library():
+    library = read_library("dat/nga")
+    assert library.names == ["IELC180"]
+    assert np.array_equal(library["IELC180"].data, quakeio.read("dat/nga/IELC180.AT2").data)
+    assert library.meta["units"] == ["g"]
+
+def test_read(tmp_path):
+    import pytest
+    _, library = _library()
+    library.save(tmp_path/"library.npz")
+    other = quakeio.read(tmp_path/"library.npz", mmap_mode="r")
+    assert isinstance(other, QuakeLibrary)
+    assert np.array_equal(other.data, library.data)
+
+    np.savez(tmp_path/"other.npz", data=library.data)
+    with pytest.raises(ValueError, match="not written by quakeio"):
+        quakeio.read(tmp_path/"other.npz")
+    with pytest.raises(ValueError, match="not a library"):
+        QuakeLibrary.load(tmp_path/"other.npz")
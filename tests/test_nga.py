@@ -1,7 +1,28 @@
-import quakeio
+import numpy as np
 
+import quakeio
+from quakeio.parse.nga import group_files
 
 
 def test_read():
     quakeio.read("dat/nga/IELC180.AT2")
 
+def test_read_data():
+    series = quakeio.read("dat/nga/IELC180.AT2")
+    assert series["time_step"] == 0.01
+    assert series["units"] == "g"
+    assert len(series.data) == 4000
+    assert series.data[0] == -.6403182E-02 and series.data[-1] == .9459335E-04
+
+def test_read_component():
+    component = quakeio.read("dat/nga/IELC180.AT2", format="nga.component")
+    assert component["component"] == "180"
+    assert component["station_name"] == "EL CENTRO ARRAY #9"
+    assert len(component.accel.data) == len(component.displ.data) == 4000
+    assert len(component.veloc.data) == 0
+    assert component.displ["units"] == "cm"
+    assert np.array_equal(component.accel.data, quakeio.read("dat/nga/IELC180.AT2").data)
+
+def test_group_files():
+    groups = group_files(["a/X1.AT2", "a/X1.dt2", "a/X2.VT2", "a/X1.txt"])
+    assert {k.name: sorted(v) for k, v in groups.items()} == {"X1": ["accel", "displ"], "X2": ["veloc"]}
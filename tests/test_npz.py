@@ -0,0 +1,34 @@
+import numpy as np
+
+import quakeio
+
+
+def test_round_trip(tmp_path):
+    from .test_csmip import test_read_event
+    event = test_read_event()
+    for options in dict(compress=True), dict():
+        quakeio.write(tmp_path/"event.npz", event, **options)
+        for mmap_mode in None, "r":
+            event_2 = quakeio.read(tmp_path/"event.npz", mmap_mode=mmap_mode)
+            assert dict(event_2) == dict(event)
+            assert list(event_2.motions) == list(event.motions)
+            for key, motion in event.motions.items():
+                assert dict(event_2.motions[key]) == dict(motion)
+                assert list(event_2.motions[key].components) == list(motion.components)
+                for drn, component in motion.components.items():
+                    other = event_2.motions[key].components[drn]
+                    assert dict(other) == dict(component)
+                    for s in "accel", "veloc", "displ":
+                        assert dict(getattr(other, s)) == dict(getattr(component, s))
+                        assert np.array_equal(getattr(other, s).data, getattr(component, s).data)
+
+    series = next(quakeio.read(tmp_path/"event.npz", mmap_mode="r").components).accel
+    assert isinstance(series.data.base, np.memmap)
+
+def test_spectra(tmp_path):
+    component = quakeio.read("dat/58658_007_20210426_10.09.54.P/chan001.v3")
+    quakeio.write(tmp_path/"chan001.npz", component)
+    other = quakeio.read(tmp_path/"chan001.npz", mmap_mode="r")
+    assert other.spectra["units"] == component.spectra["units"]
+    for key in "period", "damping", "sa":
+        assert np.array_equal(other.spectra[key], component.spectra[key])
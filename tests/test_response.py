@@ -0,0 +1,163 @@
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+import quakeio
+from quakeio.response import sdof_coefficients, response_spectrum, plan_cache_info, clear_plan_cache
+
+
+def test_sdof_coefficients():
+    dt, period, damping = 0.01, 0.5, 0.05
+    w = 2*np.pi/period
+    A, B = sdof_coefficients(dt, [period], [damping])
+    assert A.shape == B.shape == (2, 2, 1, 1)
+
+    # One step with linearly varying ground acceleration
+    a0, a1, x0 = 1.0, 3.0, [0.1, 0.2]
+    f = lambda t, x: [x[1], -(a0 + (a1 - a0)*t/dt) - 2*damping*w*x[1] - w**2*x[0]]
+    exact = solve_ivp(f, [0, dt], x0, rtol=1e-12, atol=1e-14).y[:, -1]
+    assert np.allclose(A[..., 0, 0] @ x0 + B[..., 0, 0] @ [a0, a1], exact)
+
+
+def test_response_spectrum():
+    series = quakeio.read("dat/nga/IELC180.AT2")
+    periods = np.arange(0.02, 1.0, 0.01)
+    sa = response_spectrum(series.data, series["time_step"], periods, [0.02, 0.05])
+    assert sa.shape == (2, len(periods))
+    # Spectral acceleration approaches the peak ground acceleration
+    assert np.isclose(sa[1, 0], abs(series["peak_value"]), rtol=0.02)
+    assert np.mean(sa[0]) > np.mean(sa[1])
+
+
+def test_response_spectrum_harmonic():
+    # Undamped oscillator at rest under a(t) = sin(wt) at resonance;
+    # the total acceleration is (wt cos(wt) - sin(wt))/2
+    period, dt = 1.0, 0.01
+    w = 2*np.pi/period
+    t = np.arange(0, 10*period + dt/2, dt)
+    sa = response_spectrum(np.sin(w*t), dt, [period], 0.0)
+    assert np.isclose(sa[0, 0], np.max(np.abs(w*t*np.cos(w*t) - np.sin(w*t)))/2, rtol=1e-3)
+
+
+def test_response_spectrum_batch():
+    series = quakeio.read("dat/nga/IELC180.AT2")
+    records = series.data[:3000].reshape(3, -1)
+    periods = np.arange(0.02, 1.0, 0.01)
+    sa = response_spectrum(records, series["time_step"], periods, [0.02, 0.05])
+    assert sa.shape == (3, 2, len(periods))
+    for record, expected in zip(records, sa):
+        assert np.array_equal(response_spectrum(record, series["time_step"], periods, [0.02, 0.05]), expected)
+
+
+def test_backend():
+    series = quakeio.read("dat/nga/IELC180.AT2")
+    with pytest.raises(ValueError):
+        response_spectrum(series.data, series["time_step"], [0.1, 1.0], 0.05, backend="fortran")
+
+    pytest.importorskip("numba")
+    periods = np.arange(0.02, 1.0, 0.01)
+    expected = response_spectrum(series.data, series["time_step"], periods, [0.0, 0.05])
+    compiled = response_spectrum(series.data, series["time_step"], periods, [0.0, 0.05], backend="numba")
+    assert np.allclose(compiled, expected, rtol=1e-12, atol=0.0)
+
+
+def test_backend_jax():
+    jax = pytest.importorskip("jax")
+    series = quakeio.read("dat/nga/IELC180.AT2")
+    records = series.data[:3000].reshape(3, -1)
+    periods = np.arange(0.02, 1.0, 0.01)
+    expected = response_spectrum(records, series["time_step"], periods, [0.0, 0.05])
+
+    # Double precision must be enabled by the caller
+    enabled = jax.config.jax_enable_x64
+    try:
+        jax.config.update("jax_enable_x64", False)
+        with pytest.raises(ValueError, match="64-bit"):
+            response_spectrum(records, series["time_step"], periods, [0.0, 0.05], backend="jax")
+        jax.config.update("jax_enable_x64", True)
+        traced = response_spectrum(records, series["time_step"], periods, [0.0, 0.05], backend="jax")
+    finally:
+        jax.config.update("jax_enable_x64", enabled)
+    assert traced.shape == (3, 2, len(periods))
+    assert np.allclose(traced, expected, rtol=1e-10, atol=0.0)
+
+
+def test_response_spectrum_fft():
+    series = quakeio.read("dat/nga/IELC180.AT2")
+    dt = series["time_step"]
+    periods = np.arange(0.2, 2.0, 0.1)
+    for s in "accel", "veloc", "displ":
+        expected = response_spectrum(series.data, dt, periods, [0.02, 0.05], series=s)
+        transformed = response_spectrum(series.data, dt, periods, [0.02, 0.05], series=s, method="fft")
+        assert np.allclose(transformed, expected, rtol=0.01)
+
+    # Spectral displacement is close to the pseudo-displacement
+    sa = response_spectrum(series.data, dt, periods, 0.02)
+    sd = response_spectrum(series.data, dt, periods, 0.02, series="displ")
+    assert np.allclose(sd, sa*(periods/(2*np.pi))**2, rtol=0.05)
+
+    with pytest.raises(ValueError):
+        response_spectrum(series.data, dt, periods, 0.0, method="fft")
+    with pytest.raises(ValueError):
+        response_spectrum(series.data, dt, periods, 0.05, method="fft", backend="numba")
+
+
+def test_plan_cache():
+    clear_plan_cache()
+    event = quakeio.read("dat/58658_007_20210426_10.09.54.P.zip")
+    periods = np.arange(0.1, 1.0, 0.1)
+    components = list(event.components)[:3]
+    for component in components:
+        response_spectrum(component.accel.data[:1000], component.accel["time_step"], periods, [0.02, 0.05])
+    info = plan_cache_info()
+    assert (info.misses, info.hits) == (1, len(components) - 1)
+
+    response_spectrum(components[0].accel.data[:1000], components[0].accel["time_step"], periods, 0.05)
+    assert plan_cache_info().misses == 2
+
+
+def test_collection_spectra():
+    event = quakeio.read("dat/58658_007_20210426_10.09.54.P.zip")
+    periods = np.arange(0.1, 1.0, 0.1)
+    spectra = event.spectra(periods, [0.02, 0.05], workers=2)
+    assert list(spectra) == list(event.motions)
+    for loc, motion in event.motions.items():
+        assert list(spectra[loc]) == list(motion.components)
+
+    loc, motion = next(iter(event.motions.items()))
+    drn, component = next(iter(motion.components.items()))
+    series = component.accel
+    assert np.allclose(
+        spectra[loc][drn], response_spectrum(series.data, series["time_step"], periods, [0.02, 0.05])
+    )
+
+
+def test_motion_rotd():
+    event = quakeio.read("dat/58658_007_20210426_10.09.54.P.zip")
+    motion = next(m for m in event.motions.values() if "long" in m.components and "tran" in m.components)
+    long, tran = motion.long.accel.data.copy(), motion.tran.accel.data.copy()
+
+    periods, damping = [0.1, 0.5], [0.02, 0.05]
+    rotd = motion.rotd(periods=periods, damping=damping, angles=12)
+    assert np.array_equal(motion.long.accel.data, long)
+    assert np.array_equal(motion.tran.accel.data, tran)
+
+    # Spectra of each rotated record
+    theta = np.arange(12)*np.pi/12
+    rotated = np.array([
+        response_spectrum(np.cos(a)*long + np.sin(a)*tran, motion.long.accel["time_step"], periods, damping)
+            for a in theta
+    ])
+    assert np.allclose(rotd[50], np.median(rotated, axis=0))
+    assert np.allclose(rotd[100], rotated.max(axis=0))
+
+    gmroti50 = motion.gmroti50(periods=periods, damping=damping)
+    assert gmroti50.shape == (2, 2)
+    assert np.all(gmroti50 <= rotd[100])
+
+
+def test_collection_spectra_without_time_step():
+    # Old-layout V2 headers of this archive do not give a time step
+    event = quakeio.read("dat/imperialvalley79_ce01336p.zip")
+    with pytest.warns(UserWarning, match="without a time step"):
+        assert event.spectra([0.1, 1.0], 0.05) == {}
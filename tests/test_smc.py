@@ -1,16 +1,50 @@
 import sys
+import zipfile
+
+import numpy as np
+
 import quakeio
-from quakeio.smc import read_event
+from quakeio.parse.smc import read_event
+
+
+def _write_smc(accel, component=90, channel=1):
+    # Minimal file following https://escweb.wr.usgs.gov/nsmp-data/smcfmt.html
+    txt = ["2 CORRECTED ACCELEROGRAM", *[""]*4, "          Test Station component 90", *[""]*5]
+    ihdr = np.zeros(48, dtype=int)
+    ihdr[[8, 12, 15, 16]] = channel, component, 1, len(accel)
+    rhdr = np.zeros(50)
+    rhdr[1] = 100.0 # samples per second
+    lines = [f"{l:<80}" for l in txt]
+    lines += ["".join(f"{i:10d}" for i in row) for row in ihdr.reshape(6, 8)]
+    lines += ["".join(f"{r:15.6f}" for r in row) for row in rhdr.reshape(10, 5)]
+    lines += ["| comment"]
+    lines += ["".join(f"{a:10.6f}" for a in accel[i:i+8]) for i in range(0, len(accel), 8)]
+    return "\n".join(lines) + "\n"
+
 
-#event = read_event(sys.argv[1], verbosity=3)
+def test_read_event_lazy(tmp_path):
+    accel = np.round(np.sin(np.linspace(0, 10, 101)), 6)
+    archive = tmp_path/"event.zip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as f:
+        f.writestr("sta_a.smc", _write_smc(accel))
 
-event = quakeio.read(sys.argv[1], parser="smc.read_event")
+    eager = read_event(archive)
+    lazy  = read_event(archive, lazy=True)
+    series = next(lazy.components).accel
+    assert not series.loaded
+    assert series["time_step"] == 0.01
+    assert np.array_equal(series.data, accel)
+    assert np.array_equal(series.data, next(eager.components).accel.data)
+    series.unload()
+    assert not series.loaded
 
-print(event)
 
+if __name__ == "__main__":
+    event = quakeio.read(sys.argv[1], parser="smc.read_event")
 
-for m in event.motions.values():
-    print(m)
-    for c in m.components.values():
-        print("    ", c)
+    print(event)
 
+    for m in event.motions.values():
+        print(m)
+        for c in m.components.values():
+            print("    ", c)